@@ -10,6 +10,7 @@ from __future__ import annotations
 import itertools
 import sys, re
 from enum import Enum, EnumMeta
+from types import MappingProxyType
 from typing import Union
 from graphviz import Digraph
 
@@ -23,7 +24,10 @@ class OperationTypeMeta(EnumMeta):
         """
         check that the item is contained in my member values
         """
-        return item in [v.value for v in self.__members__.values()]
+        try:
+            return item in OPERATION_TYPES
+        except TypeError:
+            return False
 
 
 class OperationType(Enum, metaclass=OperationTypeMeta):
@@ -39,6 +43,40 @@ class OperationType(Enum, metaclass=OperationTypeMeta):
     WRITE_UNLOCK = "wu"
 
 
+# precomputed, read-only code tables for the hot loops of parser and checkers
+DATA_OP = 1
+LOCK_OP = 2
+UNLOCK_OP = 4
+
+# operation string -> OperationType
+OPERATION_TYPES = MappingProxyType(
+    {op_type.value: op_type for op_type in OperationType}
+)
+# OperationType -> small int code
+OPERATION_CODES = MappingProxyType(
+    {op_type: code for code, op_type in enumerate(OperationType)}
+)
+# OperationType -> DATA_OP / LOCK_OP / UNLOCK_OP bit flags
+OPERATION_FLAGS = MappingProxyType(
+    {
+        OperationType.READ: DATA_OP,
+        OperationType.WRITE: DATA_OP,
+        OperationType.READ_LOCK: LOCK_OP,
+        OperationType.WRITE_LOCK: LOCK_OP,
+        OperationType.READ_UNLOCK: LOCK_OP | UNLOCK_OP,
+        OperationType.WRITE_UNLOCK: LOCK_OP | UNLOCK_OP,
+    }
+)
+# number of bits needed for an OPERATION_CODES value
+OPERATION_CODE_BITS = (len(OperationType) - 1).bit_length()
+DATA_OPERATIONS = frozenset(
+    op_type for op_type, flags in OPERATION_FLAGS.items() if flags & DATA_OP
+)
+LOCK_OPERATIONS = frozenset(
+    op_type for op_type, flags in OPERATION_FLAGS.items() if flags & LOCK_OP
+)
+
+
 # class Transaction:
 # there is no Transaction class yet since we only need the
 # transaction number
@@ -78,6 +116,10 @@ class Operation:
             and self.resource == obj.resource
         )
 
+    def key(self) -> tuple[int, int, str]:
+        """Returns a hashable key of what __eq__ compares: type code, transaction and resource"""
+        return (OPERATION_CODES[self.op_type], self.tx_number, self.resource)
+
     def __sr__(self, obj):
         """True if operations of same trans and on same resource"""
         return (
@@ -97,6 +139,67 @@ class Operation:
         )
 
 
+# source of the versions of VersionedList / VersionedDict - unique over all containers
+_versions = itertools.count(1)
+
+
+def _versioned(method):
+    """
+    wrap the given mutating method so that it gives its container a new version
+    """
+
+    def mutate(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self.version = next(_versions)
+        return result
+
+    mutate.__name__ = method.__name__
+    mutate.__doc__ = method.__doc__
+    return mutate
+
+
+class VersionedList(list):
+    """
+    I am a list which gets a new version on every change
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = next(_versions)
+
+    __setitem__ = _versioned(list.__setitem__)
+    __delitem__ = _versioned(list.__delitem__)
+    __iadd__ = _versioned(list.__iadd__)
+    __imul__ = _versioned(list.__imul__)
+    append = _versioned(list.append)
+    extend = _versioned(list.extend)
+    insert = _versioned(list.insert)
+    pop = _versioned(list.pop)
+    remove = _versioned(list.remove)
+    clear = _versioned(list.clear)
+    sort = _versioned(list.sort)
+    reverse = _versioned(list.reverse)
+
+
+class VersionedDict(dict):
+    """
+    I am a dict which gets a new version on every change
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = next(_versions)
+
+    __setitem__ = _versioned(dict.__setitem__)
+    __delitem__ = _versioned(dict.__delitem__)
+    __ior__ = _versioned(dict.__ior__)
+    pop = _versioned(dict.pop)
+    popitem = _versioned(dict.popitem)
+    clear = _versioned(dict.clear)
+    update = _versioned(dict.update)
+    setdefault = _versioned(dict.setdefault)
+
+
 class Schedule:
     """
     I am a container for
@@ -129,6 +232,38 @@ class Schedule:
         self.tx_count = tx_count
         self.aborts = aborts
         self.commits = commits
+        self._analysis = None
+        self._analysis_key = None
+
+    @property
+    def operations(self) -> VersionedList:
+        return self._operations
+
+    @operations.setter
+    def operations(self, operations: list[Operation]):
+        if not isinstance(operations, VersionedList):
+            operations = VersionedList(operations)
+        self._operations = operations
+
+    @property
+    def aborts(self) -> VersionedDict:
+        return self._aborts
+
+    @aborts.setter
+    def aborts(self, aborts: dict):
+        if not isinstance(aborts, VersionedDict):
+            aborts = VersionedDict(aborts)
+        self._aborts = aborts
+
+    @property
+    def commits(self) -> VersionedDict:
+        return self._commits
+
+    @commits.setter
+    def commits(self, commits: dict):
+        if not isinstance(commits, VersionedDict):
+            commits = VersionedDict(commits)
+        self._commits = commits
 
     def __repr__(self):
         return (
@@ -161,10 +296,54 @@ class Schedule:
 
     def op_trans(self, transaction: int) -> int:
         """Returns how many operations one transaction perfomed"""
-        return max(
-            0,
-            len([op for op in self.operations if op.tx_number == transaction]),
-        )
+        return len(self.analysis.transactions.get(transaction, []))
+
+    def analysis_key(self) -> tuple:
+        """
+        get the versions of my operations, commits and aborts - each change
+        of one of these containers gives it a new version
+        """
+        return (self.operations.version, self.commits.version, self.aborts.version)
+
+    @property
+    def analysis(self) -> ScheduleAnalysis:
+        """
+        get the derived relations of this schedule - computed once and cached until I change
+        """
+        key = self.analysis_key()
+        if self._analysis is None or self._analysis_key != key:
+            self._analysis = ScheduleAnalysis(self)
+            self._analysis_key = key
+        return self._analysis
+
+    def is_conflict_serializable(self) -> bool:
+        """True if the conflict graph of the operations of my not aborted transactions is acyclic"""
+        return ConflictGraph.from_schedule(self, skip_aborted=True).is_acyclic()
+
+    def recoverability_problems(self) -> list[tuple[int, int]]:
+        """
+        Returns the (writer, reader) transaction pairs violating recoverability:
+        the reader commits although the writer it read from has not committed before
+        """
+        problems = []
+        for writer, reader in sorted(self.analysis.reads_from_tx):
+            if reader in self.commits:
+                writer_commit = self.commits.get(writer)
+                if writer_commit is None or writer_commit > self.commits[reader]:
+                    problems.append((writer, reader))
+        return problems
+
+    def is_recoverable(self) -> bool:
+        """True if every transaction commits only after all transactions it read from"""
+        return len(self.recoverability_problems()) == 0
+
+    def invalidate(self):
+        """
+        drop the cached analysis - only needed after an attribute of an Operation
+        has been modified in place, all other changes are tracked by the containers
+        """
+        self._analysis = None
+        self._analysis_key = None
 
     @classmethod
     def sanitize(cls, schedule: str) -> str:
@@ -194,43 +373,50 @@ class Schedule:
         # Sanitize input
         schedule_str = Schedule.sanitize(schedule_str)
 
-        parsed_schedule = Schedule([], set(), 0, {}, {})
+        # plain containers while parsing - wrapped once by the Schedule setters
+        operations = []
+        resources = set()
+        commits = {}
+        aborts = {}
         tx = set()
         index = 0
         i = 0
+        problem = ""
         while i < len(schedule_str):
             curr_char = schedule_str[i].lower()
             next_char = schedule_str[i + 1].lower()
 
-            if curr_char + next_char in OperationType:
-                operation_type = OperationType(curr_char + next_char)
+            operation_type = OPERATION_TYPES.get(curr_char + next_char)
+            if operation_type is not None:
                 index += 1
                 i += 2
-            elif curr_char in OperationType:
-                operation_type = OperationType(curr_char)
+            elif curr_char in OPERATION_TYPES:
+                operation_type = OPERATION_TYPES[curr_char]
                 index += 1
                 i += 1
             elif curr_char == "c":
                 index += 1
-                parsed_schedule.commits[int(next_char)] = index
+                commits[int(next_char)] = index
 
                 i += 2
                 continue
             elif curr_char == "a":
                 index += 1
-                parsed_schedule.aborts[int(next_char)] = index
+                aborts[int(next_char)] = index
                 i += 2
                 continue
             else:
                 p1 = max(i - 2, 0)
                 p2 = min(i + 5, len(schedule_str) - 1)
-                return parsed_schedule, schedule_str[p1:p2]
+                problem = schedule_str[p1:p2]
+                break
 
             tx_number = schedule_str[i].lower()
             if not tx_number.isdigit():
                 p1 = max(i - 2, 0)
                 p2 = min(i + 5, len(schedule_str) - 1)
-                return parsed_schedule, schedule_str[p1:p2]
+                problem = schedule_str[p1:p2]
+                break
             tx.add(tx_number)
             i += 2
 
@@ -238,16 +424,18 @@ class Schedule:
             if not resource.isalpha():
                 p1 = max(i - 2, 0)
                 p2 = min(i + 5, len(schedule_str) - 1)
-                return parsed_schedule, schedule_str[p1:p2]
-            parsed_schedule.resources.add(resource)
+                problem = schedule_str[p1:p2]
+                break
+            resources.add(resource)
             i += 2
 
-            parsed_schedule.operations.append(
+            operations.append(
                 Operation(operation_type, int(tx_number), resource, index)
             )
 
-        parsed_schedule.tx_count = len(tx)
-        return parsed_schedule, ""
+        tx_count = 0 if problem else len(tx)
+        parsed_schedule = Schedule(operations, resources, tx_count, aborts, commits)
+        return parsed_schedule, problem
 
     @classmethod
     def parse_string(cls, schedule: Schedule) -> tuple[str, str]:
@@ -340,38 +528,96 @@ class Schedule:
             assert not mod_schedule[1]
             mod_schedule = mod_schedule[0]
         problems = []
-        org_operations = list(
-            filter(
-                lambda op: op.op_type in [OperationType.READ, OperationType.WRITE],
-                mod_schedule.operations,
-            )
-        )
+        org_operations = [
+            op for op in mod_schedule.operations if op.op_type in DATA_OPERATIONS
+        ]
+        org_keys = {op.key() for op in org_operations}
+        schedule_keys = {op.key() for op in schedule.operations}
         for x in org_operations:
-            if x in schedule.operations:
-                continue
-            else:
+            if x.key() not in schedule_keys:
                 problems.append(x)
         for y in schedule.operations:
-            if y in org_operations:
-                continue
-            else:
+            if y.key() not in org_keys:
                 problems.append(y)
+        trans_ops_mod = {}
+        for op in org_operations:
+            trans_ops_mod.setdefault(op.tx_number, []).append(op)
+        trans_ops_org = {}
+        for op in schedule.operations:
+            trans_ops_org.setdefault(op.tx_number, []).append(op)
         for i in range(1, schedule.tx_count + 1):
-            trans_op_mod = list(
-                filter(
-                    lambda op: op.op_type in [OperationType.READ, OperationType.WRITE]
-                    and op.tx_number == i,
-                    mod_schedule.operations,
-                )
-            )
-            trans_op_org = list(
-                filter(lambda op: op.tx_number == i, schedule.operations)
-            )
+            trans_op_mod = trans_ops_mod.get(i, [])
+            trans_op_org = trans_ops_org.get(i, [])
             if not (trans_op_mod == trans_op_org):
                 problems.append(f"{trans_op_mod} != {trans_op_org} at {i}")
         return problems
 
 
+class ScheduleAnalysis:
+    """
+    I am the set of relations derived from a schedule in one pass over its operations:
+        reads-from pairs,
+        the final write per resource,
+        the operations and spans per transaction,
+        and the data accesses per resource
+    """
+
+    def __init__(self, schedule: Schedule):
+        """
+        Constructor
+
+        Args:
+            schedule(Schedule): the schedule to analyse
+        """
+        self.reads_from = []
+        self.final_writes = {}
+        self.transactions = {}
+        self.accesses = {}
+        aborts = schedule.aborts
+        writes = {}
+        for op in schedule.operations:
+            self.transactions.setdefault(op.tx_number, []).append(op)
+            if op.op_type not in DATA_OPERATIONS:
+                continue
+            self.accesses.setdefault(op.resource, []).append(op)
+            if op.op_type == OperationType.WRITE:
+                writes.setdefault(op.resource, []).append(op)
+                continue
+            # read from the last write which was not aborted before the read
+            for write in reversed(writes.get(op.resource, [])):
+                if aborts.get(write.tx_number, op.index + 1) > op.index:
+                    if write.tx_number != op.tx_number:
+                        self.reads_from.append((write, op))
+                    break
+        for resource, resource_writes in writes.items():
+            for write in reversed(resource_writes):
+                if write.tx_number not in aborts:
+                    self.final_writes[resource] = write
+                    break
+        self.spans = {}
+        for tx, operations in self.transactions.items():
+            end = schedule.commits.get(tx, aborts.get(tx, operations[-1].index))
+            self.spans[tx] = (operations[0].index, end)
+        for tx, end in itertools.chain(schedule.commits.items(), aborts.items()):
+            self.spans.setdefault(tx, (end, end))
+
+    def __repr__(self):
+        return (
+            f"ScheduleAnalysis[reads_from: {self.reads_from}, final_writes: {self.final_writes}, "
+            f"spans: {self.spans}]"
+        )
+
+    @property
+    def reads_from_tx(self) -> set[tuple[int, int]]:
+        """Returns the (writer, reader) transaction pairs of the reads-from relation"""
+        return {(write.tx_number, read.tx_number) for write, read in self.reads_from}
+
+    @property
+    def last_operations(self) -> dict[int, Operation]:
+        """Returns the last operation of each transaction"""
+        return {tx: operations[-1] for tx, operations in self.transactions.items()}
+
+
 class ConflictGraph:
     """
     a conflict graph
@@ -386,12 +632,8 @@ class ConflictGraph:
         """
         self.nodes = set()
         self.edges = set()
-        cglabel = f"Konfliktgraph {labelPostfix}"
-        self.digraph = Digraph(
-            "Konfliktgraph",
-            "generiert von DBIS VL UB 8 TM.ConflictGraph",
-            graph_attr={"label": cglabel},
-        )
+        self.label = f"Konfliktgraph {labelPostfix}"
+        self._digraph = None
 
     def isEmpty(self):
         return len(self.nodes) == 0
@@ -403,14 +645,201 @@ class ConflictGraph:
             and self.edges == obj.edges
         )
 
+    @property
+    def digraph(self) -> Digraph:
+        """
+        my graphviz digraph - built from my edges in one bulk step on first use
+        """
+        if self._digraph is None:
+            self._digraph = Digraph(
+                "Konfliktgraph",
+                comment="generiert von DBIS VL UB 8 TM.ConflictGraph",
+                graph_attr={"label": self.label},
+            )
+            edges = sorted((t1.tx_number, t2.tx_number) for t1, t2 in self.edges)
+            self._digraph.edges((f"t{t1}", f"t{t2}") for t1, t2 in edges)
+        return self._digraph
+
     def get_graphviz_graph(self):
         return self.digraph
 
     def add_edge(self, t1: ConflictGraphNode, t2: ConflictGraphNode) -> None:
         self.nodes.add(t1)
         self.nodes.add(t2)
+        if (t1, t2) in self.edges:
+            return
         self.edges.add((t1, t2))
-        self.digraph.edge(f"t{t1.tx_number}", f"t{t2.tx_number}")
+        if self._digraph is not None:
+            self._digraph.edge(f"t{t1.tx_number}", f"t{t2.tx_number}")
+
+    def strongly_connected_components(self) -> list[set[int]]:
+        """
+        get the strongly connected components of my nodes (Tarjan)
+
+        Returns:
+            list of sets of transaction numbers in reverse topological order
+        """
+        successors = {node.tx_number: [] for node in self.nodes}
+        for t1, t2 in self.edges:
+            successors[t1.tx_number].append(t2.tx_number)
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+        for root in sorted(successors):
+            if root in index:
+                continue
+            work = [(root, iter(successors[root]))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is None:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = set()
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.add(member)
+                            if member == node:
+                                break
+                        components.append(component)
+                elif child not in index:
+                    index[child] = lowlink[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors[child])))
+                elif child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+        return components
+
+    def cycles(self) -> list[set[int]]:
+        """
+        get the strongly connected components which contain a cycle
+        """
+        loops = {t1.tx_number for t1, t2 in self.edges if t1 == t2}
+        return [
+            component
+            for component in self.strongly_connected_components()
+            if len(component) > 1 or component & loops
+        ]
+
+    def is_acyclic(self) -> bool:
+        """
+        True if I have no cycle, i.e. the schedule is conflict serializable
+        """
+        return len(self.cycles()) == 0
+
+    @classmethod
+    def operation_code(cls, op: Operation) -> int:
+        """
+        encode the given data operation as int: transaction number and OPERATION_CODES value
+        """
+        return op.tx_number << OPERATION_CODE_BITS | OPERATION_CODES[op.op_type]
+
+    @classmethod
+    def conflict_predecessors(
+        cls, codes, start: int, stop: int, predecessors: dict = None
+    ) -> dict[int, set[int]]:
+        """
+        collect the conflict predecessors of the encoded operations codes[start:stop]
+        which all work on the same resource and are in schedule order
+
+        The readers / writers of a resource only grow, so a transaction only has to
+        merge them again when their size changed since its last operation.
+
+        Args:
+            codes: sequence of operation codes (see operation_code)
+            start(int): first position of the resource
+            stop(int): position after the last operation of the resource
+            predecessors(dict): tx_number -> set of tx_numbers to add to - default: new dict
+
+        Returns:
+            dict tx_number -> set of tx_numbers it conflicts with (may contain itself)
+        """
+        if predecessors is None:
+            predecessors = {}
+        write_code = OPERATION_CODES[OperationType.WRITE]
+        type_mask = (1 << OPERATION_CODE_BITS) - 1
+        accessed = set()
+        writers = set()
+        # tx_number -> size of accessed / writers when last merged
+        merged_accessed = {}
+        merged_writers = {}
+        for i in range(start, stop):
+            code = codes[i]
+            tx = code >> OPERATION_CODE_BITS
+            if code & type_mask == write_code:
+                if merged_accessed.get(tx) != len(accessed):
+                    predecessors.setdefault(tx, set()).update(accessed)
+                writers.add(tx)
+                accessed.add(tx)
+                merged_accessed[tx] = len(accessed)
+                merged_writers[tx] = len(writers)
+            else:
+                if merged_writers.get(tx) != len(writers):
+                    predecessors.setdefault(tx, set()).update(writers)
+                    merged_writers[tx] = len(writers)
+                accessed.add(tx)
+        return predecessors
+
+    @classmethod
+    def predecessor_edges(cls, predecessors: dict) -> set[tuple[int, int]]:
+        """
+        get the (tx_number, tx_number) edges of the given conflict predecessors
+        """
+        return {
+            (t1, t2)
+            for t2, sources in predecessors.items()
+            for t1 in sources
+            if t1 != t2
+        }
+
+    @classmethod
+    def from_edges(
+        cls, edges: set[tuple[int, int]], labelPostfix: str = ""
+    ) -> ConflictGraph:
+        """
+        create a conflict graph from the given transaction number edges
+
+        The node and edge sets are built in bulk, the digraph only on first use.
+        """
+        graph = ConflictGraph(labelPostfix)
+        nodes = {
+            tx: ConflictGraphNode(tx) for tx in {tx for edge in edges for tx in edge}
+        }
+        graph.nodes = set(nodes.values())
+        graph.edges = {(nodes[t1], nodes[t2]) for t1, t2 in edges}
+        return graph
+
+    @classmethod
+    def from_schedule(
+        cls, schedule: Schedule, labelPostfix: str = "", skip_aborted: bool = False
+    ) -> ConflictGraph:
+        """
+        create the conflict graph of the data operations of the given schedule
+
+        Args:
+            schedule(Schedule): the schedule to analyse
+            labelPostfix(str): the postfix for the label to be used
+            skip_aborted(bool): if True ignore the operations of aborted transactions
+        """
+        predecessors = {}
+        for accesses in schedule.analysis.accesses.values():
+            codes = [
+                cls.operation_code(op)
+                for op in accesses
+                if not (skip_aborted and op.tx_number in schedule.aborts)
+            ]
+            cls.conflict_predecessors(codes, 0, len(codes), predecessors)
+        return cls.from_edges(cls.predecessor_edges(predecessors), labelPostfix)
 
 
 class ConflictGraphNode:
@@ -435,6 +864,13 @@ class SyntaxCheck:
         check_conf_set_syntax (checks syntax of strings in tuple that denotes conflicting operations)
     """
 
+    # grammar of a schedule step: an operation like w1(x) or a commit like c1
+    operation_pattern = "[rw][lu]?"
+    tx_pattern = "[1-3]"
+    resource_pattern = "[a-z]"
+    commit_pattern = "[c]"
+    step_pattern = f"{operation_pattern}{tx_pattern}[(]{resource_pattern}[)]|{commit_pattern}{tx_pattern}"
+
     def __init__(self):
         raise TypeError("Cannot create 'SyntaxCheck' instances.")
 
@@ -450,7 +886,7 @@ class SyntaxCheck:
             msg: None if ok else the problem message
         """
         schedule = Schedule.sanitize(schedule)
-        syntax_pattern = "([rw][lu]?[1-3][(][a-z][)]|[c][1-3])?"
+        syntax_pattern = f"({cls.step_pattern})?"
         p_count = re.findall(syntax_pattern, schedule).count("")
         msg = None
         if schedule == "":
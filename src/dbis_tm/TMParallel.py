@@ -0,0 +1,166 @@
+"""
+Created 2026-10
+
+Resource-partitioned parallel conflict analysis for large schedules.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from array import array
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+from dbis_tm.TM import DATA_OPERATIONS, ConflictGraph, Schedule
+
+
+def _attach(name: str) -> SharedMemory:
+    """
+    attach to the shared memory block with the given name (without tracking it twice)
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    return SharedMemory(name=name)
+
+
+def _conflict_worker(task: tuple) -> dict[int, set[int]]:
+    """
+    compute the conflict predecessors of a range of resources in the shared arrays
+
+    Args:
+        task(tuple): (codes name, offsets name, offsets length, first resource, last resource)
+    """
+    codes_name, offsets_name, offsets_len, first, last = task
+    codes_shm = _attach(codes_name)
+    offsets_shm = _attach(offsets_name)
+    codes = codes_shm.buf.cast("q")
+    offsets = offsets_shm.buf.cast("q")[:offsets_len]
+    try:
+        predecessors = {}
+        for resource in range(first, last):
+            ConflictGraph.conflict_predecessors(
+                codes, offsets[resource], offsets[resource + 1], predecessors
+            )
+        return predecessors
+    finally:
+        offsets.release()
+        codes.release()
+        offsets_shm.close()
+        codes_shm.close()
+
+
+class ParallelConflictAnalysis:
+    """
+    I build the conflict graph of a large schedule in a process pool.
+
+    The data operations are sharded by resource into a shared-memory array of
+    operation codes (see ConflictGraph.operation_code) with per-resource offsets,
+    so the workers only receive resource ranges instead of pickled Operations
+    and return their conflict predecessors per transaction.
+    """
+
+    def __init__(
+        self,
+        processes: int = None,
+        chunks_per_process: int = 4,
+        min_operations: int = 100000,
+    ):
+        """
+        Constructor
+
+        Args:
+            processes(int): number of worker processes - default: cpu count
+            chunks_per_process(int): number of resource ranges per worker for load balancing
+            min_operations(int): below this number of operations the analysis runs serially
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.chunks_per_process = chunks_per_process
+        self.min_operations = min_operations
+
+    @classmethod
+    def shard(cls, schedule: Schedule) -> tuple[array, array]:
+        """
+        shard the data operations of the given schedule by resource
+
+        Returns:
+            the operation codes grouped by resource (in schedule order per resource)
+            and the offsets of the resources within the codes
+        """
+        by_resource = {}
+        for op in schedule.operations:
+            if op.op_type in DATA_OPERATIONS:
+                by_resource.setdefault(op.resource, []).append(
+                    ConflictGraph.operation_code(op)
+                )
+        codes = array("q")
+        offsets = array("q", [0])
+        for resource_codes in by_resource.values():
+            codes.extend(resource_codes)
+            offsets.append(len(codes))
+        return codes, offsets
+
+    def chunks(self, offsets: array) -> list[tuple[int, int]]:
+        """
+        split the resources into ranges with roughly the same number of operations
+
+        Returns:
+            list of (first resource, last resource) ranges
+        """
+        resource_count = len(offsets) - 1
+        chunk_size = max(1, offsets[-1] // (self.processes * self.chunks_per_process))
+        chunks = []
+        first = 0
+        for resource in range(resource_count):
+            if offsets[resource + 1] - offsets[first] >= chunk_size:
+                chunks.append((first, resource + 1))
+                first = resource + 1
+        if first < resource_count:
+            chunks.append((first, resource_count))
+        return chunks
+
+    def conflict_edges(self, schedule: Schedule) -> set[tuple[int, int]]:
+        """
+        get the conflict edges (tx_number, tx_number) of the given schedule
+        """
+        codes, offsets = self.shard(schedule)
+        if not codes or len(codes) < self.min_operations or self.processes < 2:
+            predecessors = {}
+            for resource in range(len(offsets) - 1):
+                ConflictGraph.conflict_predecessors(
+                    codes, offsets[resource], offsets[resource + 1], predecessors
+                )
+            return ConflictGraph.predecessor_edges(predecessors)
+        codes_bytes = memoryview(codes).cast("B")
+        offsets_bytes = memoryview(offsets).cast("B")
+        codes_shm = SharedMemory(create=True, size=len(codes_bytes))
+        offsets_shm = SharedMemory(create=True, size=len(offsets_bytes))
+        try:
+            codes_shm.buf[: len(codes_bytes)] = codes_bytes
+            offsets_shm.buf[: len(offsets_bytes)] = offsets_bytes
+            tasks = [
+                (codes_shm.name, offsets_shm.name, len(offsets), first, last)
+                for first, last in self.chunks(offsets)
+            ]
+            predecessors = {}
+            with Pool(self.processes) as pool:
+                for chunk in pool.imap_unordered(_conflict_worker, tasks):
+                    for tx, sources in chunk.items():
+                        predecessors.setdefault(tx, set()).update(sources)
+            return ConflictGraph.predecessor_edges(predecessors)
+        finally:
+            codes_shm.close()
+            codes_shm.unlink()
+            offsets_shm.close()
+            offsets_shm.unlink()
+
+    def conflict_graph(
+        self, schedule: Schedule, labelPostfix: str = ""
+    ) -> ConflictGraph:
+        """
+        create the conflict graph of the given schedule
+
+        Args:
+            schedule(Schedule): the schedule to analyse
+            labelPostfix(str): the postfix for the label to be used
+        """
+        return ConflictGraph.from_edges(self.conflict_edges(schedule), labelPostfix)
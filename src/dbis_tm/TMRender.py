@@ -0,0 +1,138 @@
+"""
+Created 2026-10
+
+Rendering of (large) conflict graphs with bulk DOT generation and an output cache.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from graphviz import Digraph
+
+from dbis_tm.TM import ConflictGraph
+
+
+class ConflictGraphRenderer:
+    """
+    I render conflict graphs to DOT, SVG, PNG, ...
+
+    The DOT source is built in one bulk step from the (deduplicated) edge set and
+    rendered output is cached keyed by the edge set, so identical graphs are only
+    rendered once. Cycles can be highlighted and strongly connected components
+    can be collapsed into a single node to keep big graphs readable.
+    """
+
+    def __init__(
+        self,
+        highlight_cycles: bool = True,
+        collapse_components: bool = False,
+        cache_size: int = 128,
+    ):
+        """
+        Constructor
+
+        Args:
+            highlight_cycles(bool): if True draw the nodes and edges of cycles in red
+            collapse_components(bool): if True draw each strongly connected component as one node
+            cache_size(int): maximum number of rendered outputs to keep
+        """
+        self.highlight_cycles = highlight_cycles
+        self.collapse_components = collapse_components
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, graph: ConflictGraph, format: str) -> tuple:
+        """
+        get the cache key of the given graph and output format
+        """
+        return (
+            graph.label,
+            frozenset(node.tx_number for node in graph.nodes),
+            frozenset((t1.tx_number, t2.tx_number) for t1, t2 in graph.edges),
+            self.highlight_cycles,
+            self.collapse_components,
+            format,
+        )
+
+    def digraph(self, graph: ConflictGraph) -> Digraph:
+        """
+        build the graphviz digraph of the given conflict graph in one bulk step
+        """
+        digraph = Digraph(
+            "Konfliktgraph",
+            comment="generiert von DBIS VL UB 8 TM.ConflictGraph",
+            graph_attr={"label": graph.label},
+        )
+        name = {node.tx_number: f"t{node.tx_number}" for node in graph.nodes}
+        cycles = []
+        if self.highlight_cycles or self.collapse_components:
+            cycles = graph.cycles()
+        component_of = {}
+        for component_index, component in enumerate(cycles):
+            members = sorted(component)
+            if self.collapse_components and len(members) > 1:
+                component_name = "_".join(name[tx] for tx in members)
+                label = ", ".join(name[tx] for tx in members)
+                digraph.node(component_name, label, shape="box")
+                for tx in members:
+                    name[tx] = component_name
+            for tx in members:
+                component_of[name[tx]] = component_index
+        if self.highlight_cycles:
+            for node_name in sorted(set(component_of)):
+                digraph.node(node_name, color="red", fontcolor="red")
+        edges = set()
+        for t1, t2 in graph.edges:
+            tail, head = name[t1.tx_number], name[t2.tx_number]
+            if tail != head or t1 == t2:
+                edges.add((tail, head))
+        plain = []
+        for tail, head in sorted(edges):
+            in_cycle = tail in component_of and component_of[tail] == component_of.get(
+                head
+            )
+            if self.highlight_cycles and in_cycle:
+                digraph.edge(tail, head, color="red")
+            else:
+                plain.append((tail, head))
+        digraph.edges(plain)
+        return digraph
+
+    def source(self, graph: ConflictGraph) -> str:
+        """
+        get the DOT source of the given conflict graph
+        """
+        return self.render(graph, "dot").decode("utf-8")
+
+    def pipe(self, digraph: Digraph, format: str) -> bytes:
+        """
+        render the given digraph with graphviz to the given format
+        """
+        if format == "dot":
+            return digraph.source.encode("utf-8")
+        return digraph.pipe(format=format)
+
+    def render(self, graph: ConflictGraph, format: str = "svg") -> bytes:
+        """
+        render the given conflict graph - cached
+
+        Args:
+            graph(ConflictGraph): the graph to render
+            format(str): the graphviz output format e.g. svg, png or dot
+
+        Returns:
+            bytes: the rendered output
+        """
+        key = self.key(graph, format)
+        if key in self.cache:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        self.misses += 1
+        output = self.pipe(self.digraph(graph), format)
+        self.cache[key] = output
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return output
@@ -0,0 +1,240 @@
+"""
+Created 2026-10
+
+Replay of database logs (e.g. PostgreSQL-style statement or lock logs
+saved as CSV or JSONL) as schedules in bounded windows.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import time
+from typing import Iterable, Iterator, Union
+
+from dbis_tm.TM import Operation, OperationType, Schedule
+
+
+class ReplayWindow:
+    """
+    I am a window of consecutive log events replayed as a schedule
+    together with the results of the checks
+    """
+
+    def __init__(self, index: int, schedule: Schedule, tx_ids: dict, events: int):
+        """
+        Constructor
+
+        Args:
+            index(int): my number (starting with 1)
+            schedule(Schedule): the schedule of my events
+            tx_ids(dict): transaction number -> transaction id of the log
+            events(int): the number of log events I contain
+        """
+        self.index = index
+        self.schedule = schedule
+        self.tx_ids = tx_ids
+        self.events = events
+        self.serializable = None
+        self.recoverability_problems = None
+
+    def __repr__(self):
+        return (
+            f"ReplayWindow[index: {self.index}, events: {self.events}, "
+            f"serializable: {self.serializable}, recoverable: {self.recoverable}]"
+        )
+
+    @property
+    def recoverable(self) -> bool:
+        if self.recoverability_problems is None:
+            return None
+        return len(self.recoverability_problems) == 0
+
+    def check(self):
+        """
+        run the serializability and recoverability checks on my schedule
+        """
+        self.serializable = self.schedule.is_conflict_serializable()
+        self.recoverability_problems = [
+            (self.tx_ids[writer], self.tx_ids[reader])
+            for writer, reader in self.schedule.recoverability_problems()
+        ]
+
+
+class ReplayReport:
+    """
+    I am the summary of a log replay
+    """
+
+    def __init__(self):
+        self.events = 0
+        self.skipped = 0
+        self.windows = 0
+        self.problems = []
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        return (
+            f"ReplayReport[events: {self.events}, skipped: {self.skipped}, windows: {self.windows}, "
+            f"problems: {len(self.problems)}, {self.events_per_second:.0f} events/s]"
+        )
+
+    @property
+    def events_per_second(self) -> float:
+        if self.elapsed <= 0:
+            return 0.0
+        return self.events / self.elapsed
+
+
+class LogReplay:
+    """
+    I map log records directly to Operations and cut them into windows of
+    bounded size, each of which is checked for conflict serializability and
+    recoverability.
+
+    Transactions crossing a window boundary are only checked with the
+    part of their events inside each window.
+    """
+
+    # lowercase log action -> OperationType or "c" (commit) / "a" (abort)
+    default_actions = {
+        **{op_type.value: op_type for op_type in OperationType},
+        "c": "c",
+        "a": "a",
+        "select": OperationType.READ,
+        "update": OperationType.WRITE,
+        "insert": OperationType.WRITE,
+        "delete": OperationType.WRITE,
+        "commit": "c",
+        "abort": "a",
+        "rollback": "a",
+        "accesssharelock": OperationType.READ_LOCK,
+        "rowsharelock": OperationType.READ_LOCK,
+        "sharelock": OperationType.READ_LOCK,
+        "rowexclusivelock": OperationType.WRITE_LOCK,
+        "shareupdateexclusivelock": OperationType.WRITE_LOCK,
+        "sharerowexclusivelock": OperationType.WRITE_LOCK,
+        "exclusivelock": OperationType.WRITE_LOCK,
+        "accessexclusivelock": OperationType.WRITE_LOCK,
+    }
+
+    def __init__(
+        self,
+        window_size: int = 10000,
+        tx_field: str = "xid",
+        action_field: str = "action",
+        resource_field: str = "relation",
+        actions: dict = None,
+    ):
+        """
+        Constructor
+
+        Args:
+            window_size(int): maximum number of events per window
+            tx_field(str): the record field containing the transaction id
+            action_field(str): the record field containing the statement / lock mode
+            resource_field(str): the record field containing the resource
+            actions(dict): lowercase action -> OperationType / "c" / "a" - default: default_actions
+        """
+        self.window_size = window_size
+        self.tx_field = tx_field
+        self.action_field = action_field
+        self.resource_field = resource_field
+        self.actions = actions if actions is not None else self.default_actions
+        # resource name -> shared instance - only for the current window
+        self.resources = {}
+        self.skipped = 0
+
+    @classmethod
+    def read_records(cls, path: str) -> Iterator[dict]:
+        """
+        stream the records of the given CSV or JSONL log file
+        """
+        with open(path, newline="", encoding="utf-8") as log:
+            if path.endswith(".csv"):
+                yield from csv.DictReader(log)
+            else:
+                for line in log:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def intern(self, resource: str) -> str:
+        """
+        get the shared instance of the given resource name within the current window
+        """
+        return self.resources.setdefault(resource, resource)
+
+    def windows(self, records: Iterable[dict]) -> Iterator[ReplayWindow]:
+        """
+        map the given log records to schedules of at most window_size events
+
+        Args:
+            records(Iterable[dict]): the log records
+
+        Returns:
+            iterator over the (unchecked) windows
+        """
+        window_index = 0
+        # plain containers per window - wrapped once by the Schedule setters
+        operations, resources, commits, aborts = [], set(), {}, {}
+        tx_ids, open_tx, events = {}, {}, 0
+        self.resources = {}
+        for record in records:
+            action = self.actions.get(str(record.get(self.action_field, "")).lower())
+            tx_id = record.get(self.tx_field)
+            resource = record.get(self.resource_field)
+            if action is None or tx_id in (None, ""):
+                self.skipped += 1
+                continue
+            if isinstance(action, OperationType) and not resource:
+                self.skipped += 1
+                continue
+            tx = open_tx.get(tx_id)
+            if tx is None:
+                tx = len(tx_ids) + 1
+                tx_ids[tx] = tx_id
+                open_tx[tx_id] = tx
+            events += 1
+            if isinstance(action, OperationType):
+                resource = self.intern(str(resource))
+                operations.append(Operation(action, tx, resource, events))
+                resources.add(resource)
+            else:
+                # a reused transaction id starts a new transaction
+                del open_tx[tx_id]
+                terminated = commits if action == "c" else aborts
+                terminated[tx] = events
+            if events >= self.window_size:
+                window_index += 1
+                schedule = Schedule(operations, resources, len(tx_ids), aborts, commits)
+                yield ReplayWindow(window_index, schedule, tx_ids, events)
+                operations, resources, commits, aborts = [], set(), {}, {}
+                tx_ids, open_tx, events = {}, {}, 0
+                self.resources = {}
+        if events > 0:
+            window_index += 1
+            schedule = Schedule(operations, resources, len(tx_ids), aborts, commits)
+            yield ReplayWindow(window_index, schedule, tx_ids, events)
+
+    def replay(self, source: Union[str, Iterable[dict]]) -> ReplayReport:
+        """
+        replay the given log and check every window
+
+        Args:
+            source(str|Iterable[dict]): path of a CSV / JSONL log file or the log records
+
+        Returns:
+            the report with the windows which are not serializable or not recoverable
+        """
+        records = self.read_records(source) if isinstance(source, str) else source
+        report = ReplayReport()
+        start = time.perf_counter()
+        self.skipped = 0
+        for window in self.windows(records):
+            window.check()
+            report.windows += 1
+            report.events += window.events
+            if not (window.serializable and window.recoverable):
+                report.problems.append(window)
+        report.skipped = self.skipped
+        report.elapsed = time.perf_counter() - start
+        return report
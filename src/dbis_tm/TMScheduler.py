@@ -0,0 +1,400 @@
+"""
+Created 2026-10
+
+Scheduler engines: basic timestamp ordering, the Thomas write rule,
+optimistic concurrency control (backward validation) and strict two-phase locking.
+"""
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Optional
+
+from dbis_tm.TM import DATA_OPERATIONS, Operation, OperationType, Schedule
+
+
+class SchedulerStatistics:
+    """
+    I am the outcome of a scheduler run: counters, elapsed time
+    and the derived throughput / abort rate
+    """
+
+    def __init__(self, name: str):
+        """
+        Constructor
+
+        Args:
+            name(str): the name of the scheduler that produced me
+        """
+        self.name = name
+        self.transactions = 0
+        self.committed = 0
+        self.aborted = 0
+        self.restarts = 0
+        self.operations = 0
+        self.ignored = 0
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        return (
+            f"SchedulerStatistics[{self.name}: transactions: {self.transactions}, "
+            f"committed: {self.committed}, aborted: {self.aborted}, restarts: {self.restarts}, "
+            f"operations: {self.operations}, ignored: {self.ignored}, "
+            f"throughput: {self.throughput:.1f} tx/s, abort_rate: {self.abort_rate:.2f}]"
+        )
+
+    @property
+    def attempts(self) -> int:
+        """Returns how many transaction instances (incl. restarts) were started"""
+        return self.transactions + self.restarts
+
+    @property
+    def abort_rate(self) -> float:
+        """Returns the share of started transaction instances the scheduler aborted"""
+        if self.attempts == 0:
+            return 0.0
+        return self.aborted / self.attempts
+
+    @property
+    def throughput(self) -> float:
+        """Returns the committed transactions per second"""
+        if self.elapsed <= 0:
+            return 0.0
+        return self.committed / self.elapsed
+
+
+class Scheduler(ABC):
+    """
+    I am the common interface of all scheduler engines.
+
+    I replay the operations, commits and aborts of an input schedule in index order
+    and ask my subclass whether each step may be executed. Transactions aborted by the
+    scheduler are restarted under a fresh transaction number after the input has been
+    consumed. Lock operations of the input are ignored.
+    """
+
+    name = "Scheduler"
+
+    def __init__(self, restart: bool = True, max_restarts: int = 3):
+        """
+        Constructor
+
+        Args:
+            restart(bool): if True restart transactions aborted by the scheduler
+            max_restarts(int): how often a single transaction may be restarted
+        """
+        self.restart = restart
+        self.max_restarts = max_restarts
+
+    def reset(self):
+        """
+        reset the protocol state before a run - override me and call super
+        """
+        self.timestamps = {}
+        self.clock = 0
+        self.ignored = 0
+
+    def begin(self, tx: int):
+        """
+        start the given transaction by assigning the next timestamp
+        """
+        self.clock += 1
+        self.timestamps[tx] = self.clock
+
+    @abstractmethod
+    def operation(self, op: Operation) -> Optional[list[Operation]]:
+        """
+        schedule the given data operation
+
+        Returns:
+            the operations to execute now (possibly none) or None to abort the transaction
+        """
+
+    def commit(self, tx: int) -> Optional[list[Operation]]:
+        """
+        try to commit the given transaction
+
+        Returns:
+            the operations to execute before the commit or None to abort the transaction
+        """
+        return []
+
+    def abort(self, tx: int):
+        """
+        forget the state of the given aborted transaction
+        """
+        pass
+
+    @classmethod
+    def events(cls, schedule: Schedule) -> list[tuple]:
+        """
+        get the operations, commits and aborts of the given schedule in index order
+
+        Returns:
+            list of (index, tx_number, Operation or "c" / "a")
+        """
+        events = [(op.index, op.tx_number, op) for op in schedule.operations]
+        events += [(index, tx, "c") for tx, index in schedule.commits.items()]
+        events += [(index, tx, "a") for tx, index in schedule.aborts.items()]
+        events.sort(key=lambda event: event[0])
+        return events
+
+    def run(self, schedule: Schedule) -> tuple[Schedule, SchedulerStatistics]:
+        """
+        execute the given schedule with my protocol
+
+        Args:
+            schedule(Schedule): the input schedule
+
+        Returns:
+            the executed schedule (including aborts and restarted transactions)
+            and the statistics of the run
+        """
+        self.reset()
+        stats = SchedulerStatistics(self.name)
+        start = time.perf_counter()
+        events = self.events(schedule)
+        by_tx = {}
+        for event in events:
+            by_tx.setdefault(event[1], []).append(event)
+        stats.transactions = len(by_tx)
+        next_tx = max(by_tx.keys(), default=0) + 1
+        origin = {tx: tx for tx in by_tx}
+        restarts = {tx: 0 for tx in by_tx}
+
+        # plain containers while running - wrapped once by the Schedule setters
+        operations, resources, commits, aborts = [], set(), {}, {}
+        started = set()
+        aborted = set()
+        queue = deque(events)
+        index = 0
+        while queue:
+            _, tx, step = queue.popleft()
+            if tx in aborted or tx in commits or tx in aborts:
+                continue
+            if tx not in started:
+                started.add(tx)
+                self.begin(tx)
+            if step == "c":
+                todo = self.commit(tx)
+            elif step == "a":
+                todo = []
+            elif step.op_type in DATA_OPERATIONS:
+                todo = self.operation(step)
+            else:
+                continue
+            for op in todo or []:
+                index += 1
+                operations.append(
+                    Operation(op.op_type, op.tx_number, op.resource, index)
+                )
+                resources.add(op.resource)
+                stats.operations += 1
+            if todo is None or step == "a":
+                index += 1
+                aborts[tx] = index
+                self.abort(tx)
+                if step == "a":
+                    continue
+                aborted.add(tx)
+                stats.aborted += 1
+                original = origin[tx]
+                if self.restart and restarts[original] < self.max_restarts:
+                    restarts[original] += 1
+                    stats.restarts += 1
+                    origin[next_tx] = original
+                    for event_index, _, event_step in by_tx[original]:
+                        if isinstance(event_step, Operation):
+                            event_step = Operation(
+                                event_step.op_type,
+                                next_tx,
+                                event_step.resource,
+                                event_step.index,
+                            )
+                        queue.append((event_index, next_tx, event_step))
+                    next_tx += 1
+            elif step == "c":
+                index += 1
+                commits[tx] = index
+                stats.committed += 1
+        executed = Schedule(operations, resources, len(started), aborts, commits)
+        stats.ignored = self.ignored
+        stats.elapsed = time.perf_counter() - start
+        return executed, stats
+
+    @classmethod
+    def compare(
+        cls, schedule: Schedule, schedulers: list[Scheduler]
+    ) -> dict[str, tuple[Schedule, SchedulerStatistics]]:
+        """
+        run the same schedule through several schedulers
+
+        Returns:
+            map of scheduler name to executed schedule and statistics
+        """
+        return {scheduler.name: scheduler.run(schedule) for scheduler in schedulers}
+
+
+class TimestampOrderingScheduler(Scheduler):
+    """
+    basic timestamp ordering (TO):
+    conflicting operations have to be executed in timestamp order,
+    otherwise the younger transaction is aborted
+    """
+
+    name = "TO"
+
+    def reset(self):
+        super().reset()
+        self.read_ts = {}
+        self.write_ts = {}
+
+    def outdated_write(self, op: Operation) -> Optional[list[Operation]]:
+        """
+        handle a write that was overtaken by a younger write
+        """
+        return None
+
+    def operation(self, op: Operation) -> Optional[list[Operation]]:
+        ts = self.timestamps[op.tx_number]
+        if op.op_type == OperationType.READ:
+            if ts < self.write_ts.get(op.resource, 0):
+                return None
+            self.read_ts[op.resource] = max(ts, self.read_ts.get(op.resource, 0))
+            return [op]
+        if ts < self.read_ts.get(op.resource, 0):
+            return None
+        if ts < self.write_ts.get(op.resource, 0):
+            return self.outdated_write(op)
+        self.write_ts[op.resource] = ts
+        return [op]
+
+
+class ThomasWriteRuleScheduler(TimestampOrderingScheduler):
+    """
+    timestamp ordering with the Thomas write rule:
+    a write overtaken by a younger write is ignored instead of aborting
+    """
+
+    name = "TO-TWR"
+
+    def outdated_write(self, op: Operation) -> Optional[list[Operation]]:
+        self.ignored += 1
+        return []
+
+
+class OptimisticScheduler(Scheduler):
+    """
+    optimistic concurrency control with backward validation:
+    writes are deferred to the commit, where a transaction is aborted if a transaction
+    that committed after its start wrote something it has read
+    """
+
+    name = "OCC"
+
+    def reset(self):
+        super().reset()
+        self.committed = []
+        self.start_tn = {}
+        self.read_sets = {}
+        self.writes = {}
+
+    def begin(self, tx: int):
+        super().begin(tx)
+        self.start_tn[tx] = len(self.committed)
+        self.read_sets[tx] = set()
+        self.writes[tx] = []
+
+    def operation(self, op: Operation) -> Optional[list[Operation]]:
+        if op.op_type == OperationType.READ:
+            self.read_sets[op.tx_number].add(op.resource)
+            return [op]
+        self.writes[op.tx_number].append(op)
+        return []
+
+    def commit(self, tx: int) -> Optional[list[Operation]]:
+        read_set = self.read_sets[tx]
+        for write_set in self.committed[self.start_tn[tx] :]:
+            if write_set & read_set:
+                return None
+        writes = self.writes.pop(tx)
+        self.committed.append({op.resource for op in writes})
+        return writes
+
+    def abort(self, tx: int):
+        self.writes.pop(tx, None)
+
+
+class TwoPhaseLockingScheduler(Scheduler):
+    """
+    strict two-phase locking (S2PL) with no-wait conflict handling:
+    a read / write lock is acquired before each data operation and all locks are
+    released at the commit; a transaction requesting a lock held in a conflicting
+    mode by another transaction is aborted instead of waiting (no deadlocks).
+    The lock and unlock operations are part of the executed schedule.
+    """
+
+    name = "S2PL"
+
+    def reset(self):
+        super().reset()
+        self.read_locks = {}
+        self.write_locks = {}
+        self.held = {}
+
+    def begin(self, tx: int):
+        super().begin(tx)
+        self.held[tx] = []
+
+    def lock(self, op_type: OperationType, op: Operation) -> Operation:
+        """
+        acquire the lock of the given type for the given operation
+        """
+        if op_type == OperationType.READ_LOCK:
+            self.read_locks.setdefault(op.resource, set()).add(op.tx_number)
+        else:
+            self.write_locks[op.resource] = op.tx_number
+        lock_op = Operation(op_type, op.tx_number, op.resource, op.index)
+        self.held[op.tx_number].append(lock_op)
+        return lock_op
+
+    def operation(self, op: Operation) -> Optional[list[Operation]]:
+        tx = op.tx_number
+        writer = self.write_locks.get(op.resource)
+        if writer == tx:
+            return [op]
+        if writer is not None:
+            return None
+        readers = self.read_locks.get(op.resource, set())
+        if op.op_type == OperationType.READ:
+            if tx in readers:
+                return [op]
+            return [self.lock(OperationType.READ_LOCK, op), op]
+        if readers - {tx}:
+            return None
+        return [self.lock(OperationType.WRITE_LOCK, op), op]
+
+    def release(self, tx: int) -> list[Operation]:
+        """
+        release all locks of the given transaction
+
+        Returns:
+            the unlock operations in the order the locks were acquired
+        """
+        unlocks = []
+        for lock_op in self.held.pop(tx, []):
+            if lock_op.op_type == OperationType.READ_LOCK:
+                self.read_locks[lock_op.resource].discard(tx)
+                unlock_type = OperationType.READ_UNLOCK
+            else:
+                del self.write_locks[lock_op.resource]
+                unlock_type = OperationType.WRITE_UNLOCK
+            unlocks.append(Operation(unlock_type, tx, lock_op.resource, lock_op.index))
+        return unlocks
+
+    def commit(self, tx: int) -> Optional[list[Operation]]:
+        return self.release(tx)
+
+    def abort(self, tx: int):
+        self.release(tx)
@@ -0,0 +1,747 @@
+"""
+Created 2026-10
+
+Incremental re-checking of a schedule which is edited one step at a time.
+"""
+from __future__ import annotations
+
+import itertools
+import random
+import re
+from collections import Counter
+from typing import Iterable, Iterator, Union
+
+from dbis_tm.TM import (
+    DATA_OPERATIONS,
+    OPERATION_TYPES,
+    ConflictGraph,
+    OperationType,
+    Schedule,
+    SyntaxCheck,
+)
+
+
+class EditStep:
+    """
+    I am one step (operation or commit) of an edited schedule
+    """
+
+    # a step as accepted by SyntaxCheck.check_schedule_syntax (after sanitizing)
+    step_pattern = re.compile(
+        f"({SyntaxCheck.operation_pattern})({SyntaxCheck.tx_pattern})"
+        f"[(]({SyntaxCheck.resource_pattern})[)]"
+        f"|({SyntaxCheck.commit_pattern})({SyntaxCheck.tx_pattern})"
+    )
+
+    def __init__(self, text: str, key: int):
+        """
+        Constructor
+
+        Args:
+            text(str): the step as written by the user e.g. "w_1(x)" or "c1"
+            key(int): my order key - keys increase along the schedule
+        """
+        self.text = text
+        self.key = key
+        self.op_type = None
+        self.tx_number = None
+        self.resource = None
+        self.kind = None
+        sanitized = Schedule.sanitize(text)
+        if sanitized == "":
+            # only whitespace / underscores - does not change the schedule
+            self.kind = "empty"
+            return
+        match = self.step_pattern.fullmatch(sanitized)
+        if match is None:
+            return
+        if match.group(1):
+            self.op_type = OPERATION_TYPES[match.group(1)]
+            self.tx_number = int(match.group(2))
+            self.resource = match.group(3)
+            self.kind = "op"
+        else:
+            self.tx_number = int(match.group(5))
+            self.kind = match.group(4)
+
+    def __repr__(self):
+        return self.text
+
+    @property
+    def valid(self) -> bool:
+        return self.kind is not None
+
+    @property
+    def is_data(self) -> bool:
+        return self.op_type in DATA_OPERATIONS
+
+    @property
+    def is_write(self) -> bool:
+        return self.op_type == OperationType.WRITE
+
+    @property
+    def entry(self) -> tuple:
+        """Returns my entry in the operation sequence of my transaction: type and resource"""
+        return (self.op_type, self.resource)
+
+    @property
+    def signature(self) -> tuple:
+        """Returns what has to be contained in the original schedule: type, transaction, resource"""
+        return (self.op_type, self.tx_number, self.resource)
+
+
+class StepList:
+    """
+    I am a list of steps stored in chunks, so that inserting and deleting
+    at a position only moves the steps of one chunk. The chunks are indexed
+    by their cumulative sizes (a Fenwick tree), so a position is found in
+    logarithmic time.
+    """
+
+    chunk_size = 512
+
+    def __init__(self, steps: list = None):
+        steps = steps or []
+        size = self.chunk_size
+        self.chunks = [steps[i : i + size] for i in range(0, len(steps), size)]
+        self.length = len(steps)
+        self.visits = 0
+        self.reindex()
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self) -> Iterator:
+        return itertools.chain.from_iterable(self.chunks)
+
+    def reindex(self):
+        """
+        drop empty chunks and rebuild the cumulative size index
+        """
+        self.chunks = [chunk for chunk in self.chunks if chunk] or [[]]
+        self.sizes = [0] + [len(chunk) for chunk in self.chunks]
+        for i in range(1, len(self.sizes)):
+            parent = i + (i & -i)
+            if parent < len(self.sizes):
+                self.sizes[parent] += self.sizes[i]
+        self.top = 1 << (len(self.chunks).bit_length() - 1)
+
+    def resize(self, chunk_index: int, delta: int):
+        """
+        change the size of the given chunk in the index
+        """
+        i = chunk_index + 1
+        while i < len(self.sizes):
+            self.visits += 1
+            self.sizes[i] += delta
+            i += i & -i
+
+    def locate(self, position: int) -> tuple[int, int]:
+        """
+        get the chunk and the offset within the chunk of the given position
+        """
+        if position < 0 or position > self.length:
+            raise IndexError(position)
+        if position == self.length:
+            # behind the last step
+            return len(self.chunks) - 1, len(self.chunks[-1])
+        i = 0
+        bit = self.top
+        while bit:
+            self.visits += 1
+            if i + bit < len(self.sizes) and self.sizes[i + bit] <= position:
+                i += bit
+                position -= self.sizes[i]
+            bit >>= 1
+        return i, position
+
+    def __getitem__(self, position: int):
+        if position >= self.length:
+            raise IndexError(position)
+        chunk_index, offset = self.locate(position)
+        return self.chunks[chunk_index][offset]
+
+    def items(self, start: int, stop: int) -> list:
+        """
+        get the steps from start to stop (exclusive)
+        """
+        if start >= stop:
+            return []
+        chunk_index, offset = self.locate(start)
+        steps = itertools.chain.from_iterable(self.chunks[chunk_index:])
+        return list(itertools.islice(steps, offset, offset + stop - start))
+
+    def insert(self, position: int, step):
+        chunk_index, offset = self.locate(position)
+        chunk = self.chunks[chunk_index]
+        chunk.insert(offset, step)
+        self.length += 1
+        if len(chunk) > 2 * self.chunk_size:
+            self.chunks[chunk_index : chunk_index + 1] = [
+                chunk[: self.chunk_size],
+                chunk[self.chunk_size :],
+            ]
+            self.reindex()
+        else:
+            self.resize(chunk_index, 1)
+
+    def pop(self, position: int):
+        if position >= self.length:
+            raise IndexError(position)
+        chunk_index, offset = self.locate(position)
+        step = self.chunks[chunk_index].pop(offset)
+        self.length -= 1
+        # empty chunks stay in place until the next reindex
+        self.resize(chunk_index, -1)
+        return step
+
+
+class StepNode:
+    """
+    I am a node of a StepTree
+    """
+
+    __slots__ = ("step", "value", "priority", "left", "right", "size", "hash")
+
+    def __init__(self, step: EditStep, value: int, priority: float):
+        self.step = step
+        self.value = value
+        self.priority = priority
+        self.left = None
+        self.right = None
+        self.size = 1
+        self.hash = value
+
+
+class StepTree:
+    """
+    I am a set of steps ordered by their keys (a treap) which counts the steps
+    before a key and keeps a fingerprint of the sequence of the step values:
+    the sum of value * base^i modulo the Mersenne prime 2^61-1 over the
+    steps i = 0, 1, ... in key order. Inserting, removing and counting take
+    logarithmic time.
+    """
+
+    modulus = (1 << 61) - 1
+    base = random.randrange(2, (1 << 61) - 1)
+    # base^i modulo modulus - grows on demand
+    powers = [1]
+
+    def __init__(self, steps: Iterable[EditStep] = (), values: Iterable[int] = None):
+        """
+        Constructor
+
+        Args:
+            steps(Iterable[EditStep]): initial steps in key order
+            values(Iterable[int]): the fingerprint values of the steps - default: 0
+        """
+        # seeded priorities, so that the shape of a tree is reproducible
+        self.random = random.Random(0)
+        self.visits = 0
+        steps = list(steps)
+        values = list(values) if values is not None else [0] * len(steps)
+        self.root = self.build(steps, values)
+
+    def __len__(self):
+        return self.root.size if self.root else 0
+
+    @property
+    def fingerprint(self) -> int:
+        return self.root.hash if self.root else 0
+
+    @classmethod
+    def power(cls, exponent: int) -> int:
+        powers = cls.powers
+        while len(powers) <= exponent:
+            powers.append(powers[-1] * cls.base % cls.modulus)
+        return powers[exponent]
+
+    @classmethod
+    def fingerprint_of(cls, values: list[int]) -> int:
+        """
+        get the fingerprint of the given sequence of values
+        """
+        return sum(value * cls.power(i) for i, value in enumerate(values)) % cls.modulus
+
+    def update(self, node: StepNode):
+        """
+        recompute size and fingerprint of the given node from its children
+        """
+        left, right = node.left, node.right
+        left_size = left.size if left else 0
+        size = left_size + 1
+        fingerprint = (left.hash if left else 0) + node.value * self.power(left_size)
+        if right:
+            fingerprint += right.hash * self.power(size)
+            size += right.size
+        node.size = size
+        node.hash = fingerprint % self.modulus
+
+    def build(self, steps: list[EditStep], values: list[int]) -> StepNode:
+        """
+        build the treap of the given steps in key order in linear time
+        """
+        stack = []
+        for step, value in zip(steps, values):
+            node = StepNode(step, value, self.random.random())
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = stack.pop()
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+        root = stack[0] if stack else None
+        self.refresh(root)
+        return root
+
+    def refresh(self, node: StepNode):
+        if node is None:
+            return
+        self.refresh(node.left)
+        self.refresh(node.right)
+        self.update(node)
+
+    def split(self, node: StepNode, key: int) -> tuple[StepNode, StepNode]:
+        """
+        split the given subtree into the steps before the given key and the others
+        """
+        if node is None:
+            return None, None
+        self.visits += 1
+        if node.step.key < key:
+            node.right, right = self.split(node.right, key)
+            self.update(node)
+            return node, right
+        left, node.left = self.split(node.left, key)
+        self.update(node)
+        return left, node
+
+    def merge(self, left: StepNode, right: StepNode) -> StepNode:
+        """
+        merge the given subtrees - all keys of left are before the keys of right
+        """
+        if left is None:
+            return right
+        if right is None:
+            return left
+        self.visits += 1
+        if left.priority > right.priority:
+            left.right = self.merge(left.right, right)
+            self.update(left)
+            return left
+        right.left = self.merge(left, right.left)
+        self.update(right)
+        return right
+
+    def insert(self, step: EditStep, value: int = 0):
+        node = StepNode(step, value, self.random.random())
+        left, right = self.split(self.root, step.key)
+        self.root = self.merge(self.merge(left, node), right)
+
+    def remove(self, step: EditStep):
+        left, right = self.split(self.root, step.key)
+        node, right = self.split(right, step.key + 1)
+        assert node is not None and node.step is step
+        self.root = self.merge(left, right)
+
+    def rank(self, key: int) -> int:
+        """
+        get the number of steps before the given key
+        """
+        count = 0
+        node = self.root
+        while node is not None:
+            self.visits += 1
+            if node.step.key < key:
+                count += (node.left.size if node.left else 0) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+
+class ScheduleSession:
+    """
+    I keep a schedule which is edited step by step (e.g. a student solution)
+    together with the parsed original schedule and derived indexes.
+
+    Syntax and operation checks give the same results as
+    SyntaxCheck.check_schedule_syntax and SyntaxCheck.check:
+        - the data operations of both schedules have to be contained in the other one (as sets)
+        - for the transactions 1..tx_count of the original schedule the data operations
+          have to be in the same order as in the original schedule
+
+    Each insert / delete / move only updates the state around the edited step
+    in logarithmic time:
+        - the order of a transaction is compared by its length and the fingerprint of
+          its sequence of operations (see StepTree) - a different order is taken for the
+          original one with a probability below length / 2^61
+        - the conflicts are counted per pair of transactions by counting the operations
+          of each other transaction on the same resource before the edited step
+    """
+
+    # initial gap between the order keys of neighbouring steps
+    key_gap = 1 << 32
+
+    # split a sanitized schedule into steps - garbage becomes single char steps
+    token_pattern = re.compile(r"[a-zA-Z]+\d*(?:\([^()]*\))?|.")
+
+    def __init__(self, schedule: Union[Schedule, str], result: str = ""):
+        """
+        Constructor
+
+        Args:
+            schedule(Schedule|str): the original schedule to check against
+            result(str): the initial edited schedule
+        """
+        if isinstance(schedule, str):
+            schedule, problem = Schedule.parse_schedule(schedule)
+            assert not problem
+        self.original = schedule
+        self.original_keys = {
+            (op.op_type, op.tx_number, op.resource) for op in schedule.operations
+        }
+        # entry -> random fingerprint value
+        self.values = {}
+        self.random = random.Random()
+        original_tx = {tx: [] for tx in range(1, schedule.tx_count + 1)}
+        for op in schedule.operations:
+            if op.tx_number in original_tx:
+                original_tx[op.tx_number].append(self.value((op.op_type, op.resource)))
+        self.original_length = {tx: len(values) for tx, values in original_tx.items()}
+        self.original_fingerprint = {
+            tx: StepTree.fingerprint_of(values) for tx, values in original_tx.items()
+        }
+        self.build(self.tokenize(result))
+
+    def value(self, entry: tuple) -> int:
+        """
+        get the fingerprint value of the given entry (operation type and resource)
+        """
+        value = self.values.get(entry)
+        if value is None:
+            value = self.values[entry] = self.random.randrange(1, StepTree.modulus)
+        return value
+
+    def build(self, texts: list[str]):
+        """
+        build all indexes for the given steps in bulk
+        """
+        steps = [EditStep(text, (i + 1) * self.key_gap) for i, text in enumerate(texts)]
+        self.steps = StepList(steps)
+        self.invalid = 0
+        self.empty = 0
+        self.counts = Counter()
+        self.edges = Counter()
+        tx_steps = {tx: [] for tx in self.original_length}
+        # resource -> tx -> (all data steps, write steps) in key order
+        accesses = {}
+        for step in steps:
+            if not step.valid:
+                self.invalid += 1
+                continue
+            if step.kind == "empty":
+                self.empty += 1
+            if not step.is_data:
+                continue
+            self.counts[step.signature] += 1
+            if step.tx_number in tx_steps:
+                tx_steps[step.tx_number].append(step)
+            by_tx = accesses.setdefault(step.resource, {})
+            for other, (other_steps, other_writes) in by_tx.items():
+                if other != step.tx_number:
+                    count = len(other_steps) if step.is_write else len(other_writes)
+                    if count:
+                        self.edges[(other, step.tx_number)] += count
+            own_steps, own_writes = by_tx.setdefault(step.tx_number, ([], []))
+            own_steps.append(step)
+            if step.is_write:
+                own_writes.append(step)
+        self.extra = sum(1 for key in self.counts if key not in self.original_keys)
+        self.missing = sum(1 for key in self.original_keys if key not in self.counts)
+        # tx -> data steps of the transaction with the fingerprint values of their entries
+        self.tx_trees = {
+            tx: StepTree(steps, [self.value(step.entry) for step in steps])
+            for tx, steps in tx_steps.items()
+        }
+        # resource -> tx -> (all data steps, write steps)
+        self.accesses = {
+            resource: {
+                tx: (StepTree(own_steps), StepTree(own_writes))
+                for tx, (own_steps, own_writes) in by_tx.items()
+            }
+            for resource, by_tx in accesses.items()
+        }
+        self.misordered = set()
+        for tx in self.tx_trees:
+            self.update_order(tx)
+
+    @classmethod
+    def tokenize(cls, schedule: str) -> list[str]:
+        """
+        split the given schedule string into steps
+        """
+        return cls.token_pattern.findall(Schedule.sanitize(schedule))
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __repr__(self):
+        return "".join(step.text for step in self.steps)
+
+    def visits(self) -> int:
+        """
+        get the number of index entries visited so far - a measure of the work done
+        """
+        trees = list(self.tx_trees.values())
+        for by_tx in self.accesses.values():
+            for own_steps, own_writes in by_tx.values():
+                trees += [own_steps, own_writes]
+        return self.steps.visits + sum(tree.visits for tree in trees)
+
+    def respace(self, position: int):
+        """
+        spread the order keys around the given position evenly again,
+        widening the range until there is enough room
+        """
+        width = 16
+        while True:
+            start = max(0, position - width)
+            stop = min(len(self.steps), position + width)
+            left = self.steps[start - 1].key if start > 0 else 0
+            count = stop - start
+            if stop < len(self.steps):
+                right = self.steps[stop].key
+            else:
+                right = left + (count + 1) * self.key_gap
+            if right - left >= 4 * (count + 1):
+                spacing = (right - left) // (count + 1)
+                for i, step in enumerate(self.steps.items(start, stop)):
+                    step.key = left + (i + 1) * spacing
+                return
+            width *= 2
+
+    def new_key(self, position: int) -> int:
+        """
+        get an order key for a step inserted at the given position
+        """
+        left = self.steps[position - 1].key if position > 0 else 0
+        if position < len(self.steps):
+            right = self.steps[position].key
+        else:
+            right = left + 2 * self.key_gap
+        if right - left < 2:
+            self.respace(position)
+            return self.new_key(position)
+        return (left + right) // 2
+
+    def update_count(self, step: EditStep, delta: int):
+        """
+        add (+1) or remove (-1) the given step to / from the contained data operations
+        """
+        signature = step.signature
+        before = self.counts[signature]
+        after = before + delta
+        if after:
+            self.counts[signature] = after
+        else:
+            del self.counts[signature]
+        if (before == 0) == (after == 0):
+            return
+        change = 1 if after else -1
+        if signature in self.original_keys:
+            self.missing -= change
+        else:
+            self.extra += change
+
+    def update_order(self, tx: int):
+        """
+        update whether the data operations of the given transaction are in original order
+        """
+        tree = self.tx_trees[tx]
+        ordered = (
+            len(tree) == self.original_length[tx]
+            and tree.fingerprint == self.original_fingerprint[tx]
+        )
+        if ordered:
+            self.misordered.discard(tx)
+        else:
+            self.misordered.add(tx)
+
+    def update_sequence(self, step: EditStep, delta: int):
+        """
+        add (+1) or remove (-1) the given step to / from the sequence of its transaction
+        """
+        tree = self.tx_trees.get(step.tx_number)
+        if tree is None:
+            return
+        if delta > 0:
+            tree.insert(step, self.value(step.entry))
+        else:
+            tree.remove(step)
+        self.update_order(step.tx_number)
+
+    def update_edges(self, step: EditStep, delta: int):
+        """
+        add (+1) or remove (-1) the conflicts of the given step with the
+        operations of the other transactions on its resource
+        """
+        by_tx = self.accesses.setdefault(step.resource, {})
+        for other, (other_steps, other_writes) in by_tx.items():
+            if other == step.tx_number:
+                continue
+            conflicting = other_steps if step.is_write else other_writes
+            before = conflicting.rank(step.key)
+            after = len(conflicting) - before
+            if before:
+                self.add_edge((other, step.tx_number), delta * before)
+            if after:
+                self.add_edge((step.tx_number, other), delta * after)
+
+    def add_edge(self, edge: tuple[int, int], delta: int):
+        count = self.edges[edge] + delta
+        if count:
+            self.edges[edge] = count
+        else:
+            del self.edges[edge]
+
+    def insert(self, position: int, text: str) -> EditStep:
+        """
+        insert the given step at the given position
+
+        Args:
+            position(int): the position of the new step (0 = first)
+            text(str): the step e.g. "r1(x)" - a step split over several inserts
+                (e.g. "r1(" and "x)") is not recognized as operation
+
+        Returns:
+            the inserted step
+        """
+        step = EditStep(text, self.new_key(position))
+        self.steps.insert(position, step)
+        if not step.valid:
+            self.invalid += 1
+            return step
+        if step.kind == "empty":
+            self.empty += 1
+        if step.is_data:
+            self.update_count(step, 1)
+            self.update_sequence(step, 1)
+            self.update_edges(step, 1)
+            by_tx = self.accesses[step.resource]
+            if step.tx_number not in by_tx:
+                by_tx[step.tx_number] = (StepTree(), StepTree())
+            own_steps, own_writes = by_tx[step.tx_number]
+            own_steps.insert(step)
+            if step.is_write:
+                own_writes.insert(step)
+        return step
+
+    def delete(self, position: int) -> EditStep:
+        """
+        delete the step at the given position
+
+        Returns:
+            the deleted step
+        """
+        step = self.steps.pop(position)
+        if not step.valid:
+            self.invalid -= 1
+            return step
+        if step.kind == "empty":
+            self.empty -= 1
+        if step.is_data:
+            by_tx = self.accesses[step.resource]
+            own_steps, own_writes = by_tx[step.tx_number]
+            own_steps.remove(step)
+            if step.is_write:
+                own_writes.remove(step)
+            if not len(own_steps):
+                del by_tx[step.tx_number]
+            self.update_edges(step, -1)
+            self.update_sequence(step, -1)
+            self.update_count(step, -1)
+        return step
+
+    def move(self, source: int, target: int) -> EditStep:
+        """
+        move the step at the given source position to the target position
+        (the target position is counted after removing the step)
+
+        Returns:
+            the moved step
+        """
+        step = self.delete(source)
+        return self.insert(target, step.text)
+
+    def replace(self, position: int, text: str) -> EditStep:
+        """
+        replace the step at the given position by the given step
+
+        Returns:
+            the new step
+        """
+        self.delete(position)
+        return self.insert(position, text)
+
+    def syntax_message(self) -> str:
+        """
+        check the syntax of the edited schedule like SyntaxCheck.check_schedule_syntax
+
+        Returns:
+            msg: None if ok else the problem message
+        """
+        if self.invalid > 0:
+            # the message contains the whole schedule - only built on errors
+            return SyntaxCheck.check_schedule_syntax(str(self))
+        if self.empty == len(self.steps):
+            return "Leerer Schedule kann keine Lösung sein"
+        return None
+
+    def is_operations_same(self) -> bool:
+        """
+        True if the edited schedule has the same operations as the original schedule
+        (see Schedule.is_operations_same)
+        """
+        return self.extra == 0 and self.missing == 0 and not self.misordered
+
+    def problems(self) -> list[str]:
+        """
+        get the operations which are only contained in one of the schedules
+        and the transactions whose operations are not in the original order
+        """
+
+        def name(op_type, tx, resource):
+            return f"{op_type.value}{tx}({resource})"
+
+        problems = [name(*key) for key in self.counts if key not in self.original_keys]
+        problems += [name(*key) for key in self.original_keys if key not in self.counts]
+        problems += [f"order at {tx}" for tx in sorted(self.misordered)]
+        return problems
+
+    def message(self, index) -> str:
+        """
+        check the edited schedule against the original schedule like SyntaxCheck.check
+        """
+        if not self.is_operations_same():
+            return f"schedule_{index} enthält unterschiedliche oder nicht alle Operationen aus s{index}"
+        return None
+
+    def conflict_edges(self) -> set[tuple[int, int]]:
+        """
+        get the conflict edges (tx_number, tx_number) of the edited schedule
+        """
+        return set(self.edges)
+
+    def conflict_graph(self, labelPostfix: str = "") -> ConflictGraph:
+        """
+        get the conflict graph of the edited schedule
+        """
+        return ConflictGraph.from_edges(self.conflict_edges(), labelPostfix)
+
+    def schedule(self) -> tuple[Schedule, str]:
+        """
+        parse the edited schedule - O(n), for final checks only
+        """
+        return Schedule.parse_schedule(str(self))
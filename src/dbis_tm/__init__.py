@@ -1,9 +1,33 @@
 from dbis_tm.TM import (
     Schedule,
+    ScheduleAnalysis,
+    VersionedList,
+    VersionedDict,
     OperationTypeMeta,
     OperationType,
     Operation,
     ConflictGraph,
     ConflictGraphNode,
     SyntaxCheck,
+    OPERATION_TYPES,
+    OPERATION_CODES,
+    OPERATION_FLAGS,
+    OPERATION_CODE_BITS,
+    DATA_OP,
+    LOCK_OP,
+    UNLOCK_OP,
+    DATA_OPERATIONS,
+    LOCK_OPERATIONS,
 )
+from dbis_tm.TMScheduler import (
+    SchedulerStatistics,
+    Scheduler,
+    TimestampOrderingScheduler,
+    ThomasWriteRuleScheduler,
+    OptimisticScheduler,
+    TwoPhaseLockingScheduler,
+)
+from dbis_tm.TMParallel import ParallelConflictAnalysis
+from dbis_tm.TMRender import ConflictGraphRenderer
+from dbis_tm.TMSession import EditStep, ScheduleSession
+from dbis_tm.TMReplay import ReplayWindow, ReplayReport, LogReplay
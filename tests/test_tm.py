@@ -1,4 +1,21 @@
-from dbis_tm import Schedule, ConflictGraph, ConflictGraphNode, SyntaxCheck
+import timeit
+import warnings
+from dbis_tm import (
+    Schedule,
+    Operation,
+    ConflictGraph,
+    ConflictGraphNode,
+    SyntaxCheck,
+    OperationType,
+    OPERATION_TYPES,
+    OPERATION_CODES,
+    OPERATION_CODE_BITS,
+    OPERATION_FLAGS,
+    DATA_OP,
+    LOCK_OP,
+    UNLOCK_OP,
+    DATA_OPERATIONS,
+)
 from tests.scheduletest import ScheduleTest
 
 
@@ -87,6 +104,152 @@ class Test_TM(ScheduleTest):
             # returned =len(problems)==0
             self.assertEqual(returned, result)
 
+    def testScheduleAnalysis(self):
+        """
+        test the cached reads-from and final-state analysis of a schedule
+        """
+        schedule, _ = Schedule.parse_schedule(
+            "w1(x)r2(x)w3(y)a3r1(y)w2(y)r1(x)c1w2(x)c2"
+        )
+        analysis = schedule.analysis
+        self.assertIs(analysis, schedule.analysis)
+        self.assertEqual(
+            ["w1(x)->r2(x)"],
+            [f"{write}->{read}" for write, read in analysis.reads_from],
+        )
+        self.assertEqual({(1, 2)}, analysis.reads_from_tx)
+        self.assertEqual(
+            {"x": "w2(x)", "y": "w2(y)"},
+            {res: str(op) for res, op in analysis.final_writes.items()},
+        )
+        self.assertEqual({1: (1, 8), 2: (2, 10), 3: (3, 4)}, analysis.spans)
+        self.assertEqual("r1(x)", str(analysis.last_operations[1]))
+        self.assertEqual(
+            ["w1(x)", "r2(x)", "r1(x)", "w2(x)"],
+            [str(op) for op in analysis.accesses["x"]],
+        )
+        self.assertEqual(3, schedule.op_trans(2))
+        schedule.operations.append(Operation(OperationType.READ, 3, "z", 11))
+        self.assertIsNot(analysis, schedule.analysis)
+        self.assertEqual(["r3(z)"], [str(op) for op in schedule.analysis.accesses["z"]])
+        analysis = schedule.analysis
+        schedule.invalidate()
+        self.assertIsNot(analysis, schedule.analysis)
+
+    def testScheduleAnalysisInvalidation(self):
+        """
+        test that replacing, swapping and re-appending invalidates the cached analysis
+        """
+        schedule, _ = Schedule.parse_schedule("w1(x)r2(x)w1(y)c1c2")
+        self.assertEqual({(1, 2)}, schedule.analysis.reads_from_tx)
+        # replace a middle operation
+        schedule.operations[1] = Operation(OperationType.WRITE, 2, "x", 2)
+        self.assertEqual([], schedule.analysis.reads_from)
+        self.assertEqual("w2(x)", str(schedule.analysis.final_writes["x"]))
+        # swap the commit indexes
+        self.assertEqual({1: (1, 4), 2: (2, 5)}, schedule.analysis.spans)
+        schedule.commits[1], schedule.commits[2] = (
+            schedule.commits[2],
+            schedule.commits[1],
+        )
+        self.assertEqual({1: (1, 5), 2: (2, 4)}, schedule.analysis.spans)
+        # pop and append a new operation keeping the length
+        schedule.operations.pop()
+        schedule.operations.append(Operation(OperationType.READ, 2, "x", 3))
+        self.assertEqual(
+            ["r2(x)"], [str(op) for op in schedule.analysis.accesses["x"][2:]]
+        )
+        self.assertNotIn("y", schedule.analysis.accesses)
+        # replace the whole list
+        schedule.operations = [Operation(OperationType.READ, 1, "z", 1)]
+        self.assertEqual(["z"], list(schedule.analysis.accesses))
+        # an in place change of an operation needs an explicit invalidate
+        schedule.operations[0].resource = "y"
+        schedule.invalidate()
+        self.assertEqual(["y"], list(schedule.analysis.accesses))
+
+    def testScheduleChecks(self):
+        """
+        test conflict serializability and recoverability of schedules
+        """
+        for schedule_str, serializable, recoverable in [
+            ("w1(x)r2(x)c1c2", True, True),
+            ("w1(x)r2(x)c2c1", True, False),
+            ("w1(x)r2(x)c2a1", True, False),
+            ("r1(x)w2(x)w1(x)c1c2", False, True),
+            ("w1(x)w2(x)a2r1(x)c1", True, True),
+        ]:
+            schedule, _ = Schedule.parse_schedule(schedule_str)
+            self.assertEqual(serializable, schedule.is_conflict_serializable())
+            self.assertEqual(recoverable, schedule.is_recoverable(), schedule_str)
+        schedule, _ = Schedule.parse_schedule("w1(x)r2(x)c2c1")
+        self.assertEqual([(1, 2)], schedule.recoverability_problems())
+
+    def testOperationCodeTables(self):
+        """
+        test the precomputed OperationType code tables
+        """
+        for op_type in OperationType:
+            self.assertIs(op_type, OPERATION_TYPES[op_type.value])
+            self.assertTrue(op_type.value in OperationType)
+        self.assertFalse("x" in OperationType)
+        self.assertFalse([] in OperationType)
+        self.assertEqual(len(OperationType), len(set(OPERATION_CODES.values())))
+        self.assertLess(max(OPERATION_CODES.values()), 1 << OPERATION_CODE_BITS)
+        self.assertEqual(
+            {OperationType.READ, OperationType.WRITE}, set(DATA_OPERATIONS)
+        )
+        self.assertEqual(DATA_OP, OPERATION_FLAGS[OperationType.READ])
+        self.assertEqual(LOCK_OP, OPERATION_FLAGS[OperationType.WRITE_LOCK])
+        self.assertTrue(OPERATION_FLAGS[OperationType.READ_UNLOCK] & UNLOCK_OP)
+        with self.assertRaises(TypeError):
+            OPERATION_TYPES["x"] = OperationType.READ
+
+    def testParserBenchmark(self):
+        """
+        microbenchmark the parser and the comparator which use the code tables
+        and compare the code table lookup with the old enum lookup
+        """
+        steps = [
+            f"{op}{1 + i % 3}({chr(97 + i % 26)})"
+            for i, op in enumerate(["r", "w", "rl", "wl", "ru", "wu"] * 500)
+        ]
+        schedule_str = "".join(steps)
+        number = 10
+        parse_time = timeit.timeit(
+            lambda: Schedule.parse_schedule(schedule_str), number=number
+        )
+        schedule, msg = Schedule.parse_schedule(schedule_str)
+        self.assertEqual("", msg)
+        self.assertEqual(len(steps), len(schedule.operations))
+        check_time = timeit.timeit(
+            lambda: Schedule.check_operations_same(schedule, schedule), number=number
+        )
+        # the operation lookup of the parser hot loop: old enum path vs code table
+        values = [op.op_type.value for op in schedule.operations]
+        members = OperationType.__members__.values()
+
+        def enum_lookup():
+            for value in values:
+                if value in [v.value for v in members]:
+                    OperationType(value)
+
+        def table_lookup():
+            for value in values:
+                OPERATION_TYPES.get(value)
+
+        enum_time = timeit.timeit(enum_lookup, number=number)
+        table_time = timeit.timeit(table_lookup, number=number)
+        if self.profile:
+            print(
+                f"{len(steps)} operations: parse_schedule {parse_time / number * 1000:.2f} ms "
+                f"({len(steps) * number / parse_time:.0f} ops/s), "
+                f"check_operations_same {check_time / number * 1000:.2f} ms, "
+                f"lookup enum {enum_time / number * 1000:.2f} ms / "
+                f"table {table_time / number * 1000:.2f} ms "
+                f"({enum_time / table_time:.1f}x)"
+            )
+
     def testEdgeLessConflictGraph(self):
         """
         test the content of an empty graph
@@ -110,6 +273,49 @@ class Test_TM(ScheduleTest):
         if debug:
             print(gvMarkup)
         self.assertTrue("t1 -> t2" in str(gvMarkup))
+        g_1.add_edge(t1, t2)
+        self.assertEqual(1, str(g_1.get_graphviz_graph()).count("t1 -> t2"))
+
+    def testConflictGraphDigraph(self):
+        """
+        test the name, comment and render file name of the graphviz digraph
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            digraph = ConflictGraph("s1").get_graphviz_graph()
+        self.assertEqual("Konfliktgraph", digraph.name)
+        self.assertEqual("generiert von DBIS VL UB 8 TM.ConflictGraph", digraph.comment)
+        self.assertEqual("Konfliktgraph.gv", digraph.filename)
+
+    def testConflictGraphFromEdges(self):
+        """
+        test building a conflict graph from edges in bulk with a lazy digraph
+        """
+        edges = {(1, 2), (2, 3), (3, 1), (1, 2)}
+        graph = ConflictGraph.from_edges(edges)
+        expected = ConflictGraph()
+        for t1, t2 in [(3, 1), (1, 2), (2, 3)]:
+            expected.add_edge(ConflictGraphNode(t1), ConflictGraphNode(t2))
+        self.assertEqual(expected, graph)
+        self.assertEqual({1, 2, 3}, {node.tx_number for node in graph.nodes})
+        source = str(graph.get_graphviz_graph())
+        self.assertLess(source.index("t1 -> t2"), source.index("t3 -> t1"))
+        graph.add_edge(ConflictGraphNode(3), ConflictGraphNode(4))
+        graph.add_edge(ConflictGraphNode(3), ConflictGraphNode(4))
+        self.assertEqual(1, str(graph.get_graphviz_graph()).count("t3 -> t4"))
+        self.assertTrue(ConflictGraph.from_edges(set()).isEmpty())
+
+    def testConflictGraphCycles(self):
+        """
+        test the strongly connected components and cycles of a conflict graph
+        """
+        graph = ConflictGraph.from_edges({(1, 2), (2, 3), (3, 1), (3, 4), (5, 5)})
+        components = graph.strongly_connected_components()
+        self.assertEqual(3, len(components))
+        self.assertIn({1, 2, 3}, components)
+        self.assertEqual([{1, 2, 3}, {5}], sorted(graph.cycles(), key=min))
+        self.assertFalse(graph.is_acyclic())
+        self.assertTrue(ConflictGraph.from_edges({(1, 2), (2, 3)}).is_acyclic())
 
     def testConfSyntaxCheck(self):
         """
@@ -0,0 +1,93 @@
+import os
+import random
+import time
+from dbis_tm import (
+    Schedule,
+    Operation,
+    OperationType,
+    ConflictGraph,
+    ConflictGraphNode,
+    ParallelConflictAnalysis,
+)
+from tests.scheduletest import ScheduleTest
+
+
+class Test_TMParallel(ScheduleTest):
+    """
+    test the resource-partitioned conflict analysis
+    """
+
+    def getRandomSchedule(self, op_count: int, tx_count: int, resource_count: int):
+        """
+        get a random schedule with the given dimensions
+        """
+        rng = random.Random(42)
+        operations = [
+            Operation(
+                rng.choice([OperationType.READ, OperationType.WRITE]),
+                rng.randint(1, tx_count),
+                f"x{rng.randrange(resource_count)}",
+                index,
+            )
+            for index in range(1, op_count + 1)
+        ]
+        resources = {op.resource for op in operations}
+        return Schedule(operations, resources, tx_count, {}, {})
+
+    def testConflictGraphFromSchedule(self):
+        """
+        test the serial conflict graph of a schedule
+        """
+        schedule, _ = Schedule.parse_schedule("r1(x)w2(x)rl1(y)r1(y)w3(y)r2(z)r3(z)c1")
+        graph = ConflictGraph.from_schedule(schedule)
+        expected = ConflictGraph()
+        expected.add_edge(ConflictGraphNode(1), ConflictGraphNode(2))
+        expected.add_edge(ConflictGraphNode(1), ConflictGraphNode(3))
+        self.assertEqual(expected, graph)
+
+    def testParallelConflictGraph(self):
+        """
+        test that the parallel analysis matches the serial one
+        """
+        schedule = self.getRandomSchedule(20000, 30, 200)
+        serial = ConflictGraph.from_schedule(schedule)
+        analysis = ParallelConflictAnalysis(processes=2, min_operations=0)
+        parallel = analysis.conflict_graph(schedule)
+        self.assertEqual(serial, parallel)
+        chunks = analysis.chunks(analysis.shard(schedule)[1])
+        self.assertEqual(0, chunks[0][0])
+        self.assertEqual(200, chunks[-1][1])
+        for example in self.getScheduleExamples():
+            schedule, _ = Schedule.parse_schedule(example["result"])
+            self.assertEqual(
+                ConflictGraph.from_schedule(schedule), analysis.conflict_graph(schedule)
+            )
+        self.assertTrue(
+            analysis.conflict_graph(Schedule([], set(), 0, {}, {})).isEmpty()
+        )
+
+    def testParallelTiming(self):
+        """
+        profile the serial against the parallel analysis of a large schedule
+        """
+        schedule = self.getRandomSchedule(200000, 200, 1000)
+        timings = {}
+        results = {}
+        for processes in [1, 2, 4]:
+            analysis = ParallelConflictAnalysis(processes=processes, min_operations=0)
+            start = time.perf_counter()
+            results[processes] = analysis.conflict_edges(schedule)
+            timings[processes] = time.perf_counter() - start
+        start = time.perf_counter()
+        graph = ConflictGraph.from_edges(results[1])
+        merge = time.perf_counter() - start
+        if self.profile:
+            cpus = os.cpu_count()
+            for processes, elapsed in timings.items():
+                print(
+                    f"{processes} process(es) on {cpus} cpu(s): {elapsed:.2f} s "
+                    f"(speedup {timings[1] / elapsed:.2f}x)"
+                )
+            print(f"from_edges of {len(graph.edges)} edges: {merge:.2f} s")
+        self.assertEqual(results[1], results[2])
+        self.assertEqual(results[1], results[4])
@@ -0,0 +1,57 @@
+from graphviz import ExecutableNotFound
+from dbis_tm import ConflictGraph, ConflictGraphRenderer
+from tests.scheduletest import ScheduleTest
+
+
+class Test_TMRender(ScheduleTest):
+    """
+    test the conflict graph rendering
+    """
+
+    def getCyclicGraph(self):
+        """
+        get a graph with the cycle t1 -> t2 -> t3 -> t1 and the edge t3 -> t4
+        """
+        return ConflictGraph.from_edges({(1, 2), (2, 3), (3, 1), (3, 4)})
+
+    def testSource(self):
+        """
+        test the bulk DOT source with highlighted cycles
+        """
+        source = ConflictGraphRenderer().source(self.getCyclicGraph())
+        debug = False
+        if debug:
+            print(source)
+        self.assertIn("t1 -> t2 [color=red]", source)
+        self.assertIn("t3 [color=red fontcolor=red]", source)
+        self.assertIn("t3 -> t4\n", source)
+        self.assertNotIn("t4 [color=red", source)
+        self.assertEqual(1, source.count("t1 -> t2"))
+
+    def testCollapse(self):
+        """
+        test collapsing strongly connected components
+        """
+        renderer = ConflictGraphRenderer(collapse_components=True)
+        source = renderer.source(self.getCyclicGraph())
+        self.assertIn('t1_t2_t3 [label="t1, t2, t3" shape=box]', source)
+        self.assertIn("t1_t2_t3 -> t4", source)
+        self.assertNotIn("t1 -> t2", source)
+
+    def testCache(self):
+        """
+        test that identical graphs are only rendered once
+        """
+        renderer = ConflictGraphRenderer(cache_size=1)
+        first = renderer.render(self.getCyclicGraph(), "dot")
+        second = renderer.render(self.getCyclicGraph(), "dot")
+        self.assertIs(first, second)
+        self.assertEqual((1, 1), (renderer.hits, renderer.misses))
+        renderer.render(ConflictGraph.from_edges({(1, 2)}), "dot")
+        renderer.render(self.getCyclicGraph(), "dot")
+        self.assertEqual((1, 3), (renderer.hits, renderer.misses))
+        try:
+            svg = renderer.render(self.getCyclicGraph(), "svg")
+        except ExecutableNotFound:
+            self.skipTest("graphviz executable not installed")
+        self.assertIn(b"<svg", svg)
@@ -0,0 +1,96 @@
+import os
+from dbis_tm import LogReplay, OperationType, Schedule
+from tests.scheduletest import ScheduleTest
+
+
+class Test_TMReplay(ScheduleTest):
+    """
+    test replaying database logs as schedules
+    """
+
+    def getResource(self, name: str) -> str:
+        return os.path.join(os.path.dirname(__file__), "resources", name)
+
+    def testStatementLog(self):
+        """
+        test replaying the CSV statement log in windows
+        """
+        replay = LogReplay(window_size=6, action_field="statement")
+        windows = list(
+            replay.windows(replay.read_records(self.getResource("pg_statements.csv")))
+        )
+        self.assertEqual([6, 6, 4], [window.events for window in windows])
+        schedule_str, msg = Schedule.parse_string(windows[0].schedule)
+        self.assertEqual("", msg)
+        self.assertEqual(
+            "r1(accounts) r2(accounts) w1(accounts) w2(accounts) c1 c2 ", schedule_str
+        )
+        self.assertEqual({1: "701", 2: "702"}, windows[0].tx_ids)
+        self.assertIs(
+            windows[1].schedule.operations[0].resource,
+            windows[1].schedule.operations[2].resource,
+        )
+        report = LogReplay(window_size=6, action_field="statement").replay(
+            self.getResource("pg_statements.csv")
+        )
+        if self.profile:
+            print(report)
+        self.assertEqual(16, report.events)
+        self.assertEqual(3, report.windows)
+        self.assertEqual([1, 3], [window.index for window in report.problems])
+        first, third = report.problems
+        self.assertFalse(first.serializable)
+        self.assertTrue(first.recoverable)
+        self.assertTrue(third.serializable)
+        self.assertEqual([("705", "706")], third.recoverability_problems)
+        self.assertGreater(report.events_per_second, 0)
+
+    def testLockLog(self):
+        """
+        test replaying the JSONL lock log including unknown actions
+        """
+        replay = LogReplay()
+        windows = list(
+            replay.windows(replay.read_records(self.getResource("pg_locks.jsonl")))
+        )
+        self.assertEqual(1, len(windows))
+        schedule = windows[0].schedule
+        self.assertEqual(1, replay.skipped)
+        self.assertEqual(
+            [OperationType.WRITE_LOCK, OperationType.WRITE, OperationType.READ_LOCK],
+            [op.op_type for op in schedule.operations[:3]],
+        )
+        self.assertEqual({1: 3, 2: 6}, schedule.commits)
+        report = LogReplay().replay(self.getResource("pg_locks.jsonl"))
+        self.assertEqual(6, report.events)
+        self.assertEqual(1, report.skipped)
+        self.assertEqual([], report.problems)
+
+    def testReusedTransactionId(self):
+        """
+        test that a transaction id reused after its commit is a new transaction
+        """
+        records = [
+            {"xid": 1, "action": "w", "relation": "x"},
+            {"xid": 1, "action": "c"},
+            {"xid": 1, "action": "r", "relation": "x"},
+            {"xid": 1, "action": "c"},
+        ]
+        window = next(LogReplay().windows(records))
+        self.assertEqual({1: 2, 2: 4}, window.schedule.commits)
+        self.assertEqual(2, window.schedule.tx_count)
+
+    def testInternPerWindow(self):
+        """
+        test that resource names are shared within a window and only kept for one window
+        """
+        records = [
+            {"xid": i, "action": "r", "relation": "".join(["res", str(i // 2)])}
+            for i in range(100)
+        ]
+        replay = LogReplay(window_size=10)
+        for window in replay.windows(records):
+            self.assertLessEqual(len(replay.resources), 10)
+            first, second = window.schedule.operations[:2]
+            self.assertIs(first.resource, second.resource)
+        self.assertEqual({}, replay.resources)
@@ -0,0 +1,121 @@
+from dbis_tm import (
+    Schedule,
+    TimestampOrderingScheduler,
+    ThomasWriteRuleScheduler,
+    OptimisticScheduler,
+    TwoPhaseLockingScheduler,
+    Scheduler,
+)
+from tests.scheduletest import ScheduleTest
+
+
+class Test_TMScheduler(ScheduleTest):
+    """
+    test the non-locking scheduler engines
+    """
+
+    def run_scheduler(self, scheduler, schedule_str: str):
+        schedule, msg = Schedule.parse_schedule(schedule_str)
+        self.assertEqual("", msg)
+        executed, stats = scheduler.run(schedule)
+        executed_str, msg = Schedule.parse_string(executed)
+        self.assertEqual("", msg)
+        return Schedule.sanitize(executed_str), stats
+
+    def testTimestampOrdering(self):
+        """
+        test basic timestamp ordering with restarts
+        """
+        executed, stats = self.run_scheduler(
+            TimestampOrderingScheduler(), "r1(x)r2(x)w2(x)w1(x)c1c2"
+        )
+        self.assertEqual("r1(x)r2(x)w2(x)a1c2r3(x)w3(x)c3", executed)
+        self.assertEqual(2, stats.committed)
+        self.assertEqual(1, stats.aborted)
+        self.assertEqual(1, stats.restarts)
+        self.assertAlmostEqual(1 / 3, stats.abort_rate)
+        executed, stats = self.run_scheduler(
+            TimestampOrderingScheduler(restart=False), "r1(x)r2(x)w2(x)w1(x)c1c2"
+        )
+        self.assertEqual("r1(x)r2(x)w2(x)a1c2", executed)
+        self.assertEqual(0, stats.restarts)
+
+    def testThomasWriteRule(self):
+        """
+        test that outdated writes are ignored
+        """
+        executed, stats = self.run_scheduler(
+            ThomasWriteRuleScheduler(), "w1(x)w2(x)w1(x)c1c2"
+        )
+        self.assertEqual("w1(x)w2(x)c1c2", executed)
+        self.assertEqual(1, stats.ignored)
+        self.assertEqual(0, stats.aborted)
+        executed, stats = self.run_scheduler(
+            TimestampOrderingScheduler(), "w1(x)w2(x)w1(x)c1c2"
+        )
+        self.assertEqual(1, stats.aborted)
+
+    def testOptimistic(self):
+        """
+        test backward validation with deferred writes
+        """
+        executed, stats = self.run_scheduler(
+            OptimisticScheduler(), "r1(x)r2(x)w2(x)c2w1(y)c1"
+        )
+        self.assertEqual("r1(x)r2(x)w2(x)c2a1r3(x)w3(y)c3", executed)
+        self.assertEqual(1, stats.aborted)
+        executed, stats = self.run_scheduler(
+            OptimisticScheduler(), "r1(x)w1(x)r2(y)w2(y)c1c2"
+        )
+        self.assertEqual("r1(x)r2(y)w1(x)c1w2(y)c2", executed)
+        self.assertEqual(0, stats.aborted)
+        self.assertEqual(0.0, stats.abort_rate)
+
+    def testTwoPhaseLocking(self):
+        """
+        test strict two-phase locking with no-wait aborts
+        """
+        executed, stats = self.run_scheduler(
+            TwoPhaseLockingScheduler(), "r1(x)r2(x)w2(x)w1(y)c1c2"
+        )
+        self.assertEqual(
+            "rl1(x)r1(x)rl2(x)r2(x)a2wl1(y)w1(y)ru1(x)wu1(y)c1"
+            "rl3(x)r3(x)wl3(x)w3(x)ru3(x)wu3(x)c3",
+            executed,
+        )
+        self.assertEqual(1, stats.aborted)
+        self.assertEqual(2, stats.committed)
+        executed, stats = self.run_scheduler(
+            TwoPhaseLockingScheduler(), "r1(x)w1(x)r2(y)c1r2(x)c2"
+        )
+        self.assertEqual(
+            "rl1(x)r1(x)wl1(x)w1(x)rl2(y)r2(y)ru1(x)wu1(x)c1rl2(x)r2(x)ru2(y)ru2(x)c2",
+            executed,
+        )
+        self.assertEqual(0, stats.aborted)
+
+    def testAbstract(self):
+        """
+        test that a scheduler has to implement operation
+        """
+        with self.assertRaises(TypeError):
+            Scheduler()
+
+    def testCompare(self):
+        """
+        test running the schedule examples through all engines
+        """
+        schedulers = [
+            TimestampOrderingScheduler(),
+            ThomasWriteRuleScheduler(),
+            OptimisticScheduler(),
+            TwoPhaseLockingScheduler(),
+        ]
+        for example in self.getScheduleExamples():
+            schedule, _ = Schedule.parse_schedule(example["schedule"])
+            results = TimestampOrderingScheduler.compare(schedule, schedulers)
+            self.assertEqual(["TO", "TO-TWR", "OCC", "S2PL"], list(results.keys()))
+            for executed, stats in results.values():
+                self.assertEqual(3, stats.transactions)
+                self.assertEqual(3, stats.committed)
+                self.assertEqual([], executed.active())
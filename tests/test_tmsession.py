@@ -0,0 +1,222 @@
+import random
+import time
+from dbis_tm import (
+    Schedule,
+    ConflictGraph,
+    SyntaxCheck,
+    ScheduleSession,
+)
+from tests.scheduletest import ScheduleTest
+
+
+class Test_TMSession(ScheduleTest):
+    """
+    test incremental re-checking of edited schedules
+    """
+
+    def assertConsistent(self, session: ScheduleSession, index: int, schedule: str):
+        """
+        check the incremental state of the session against a full recheck
+        """
+        result = str(session)
+        expected_syntax = SyntaxCheck.check_schedule_syntax(result)
+        self.assertEqual(expected_syntax, session.syntax_message())
+        if expected_syntax is not None:
+            return
+        self.assertEqual(
+            SyntaxCheck.check(index, schedule, result), session.message(index)
+        )
+        parsed, _ = session.schedule()
+        self.assertEqual(ConflictGraph.from_schedule(parsed), session.conflict_graph())
+
+    def testExamples(self):
+        """
+        test the schedule examples step by step
+        """
+        for example in self.getScheduleExamples():
+            index, schedule = example["index"], example["schedule"]
+            session = ScheduleSession(schedule)
+            self.assertEqual(
+                "Leerer Schedule kann keine Lösung sein", session.syntax_message()
+            )
+            for position, text in enumerate(
+                ScheduleSession.tokenize(example["result"])
+            ):
+                session.insert(position, text)
+                self.assertConsistent(session, index, schedule)
+            self.assertTrue(session.is_operations_same())
+            self.assertEqual([], session.problems())
+
+    def testSyntax(self):
+        """
+        test that the syntax check of the session follows SyntaxCheck.check_schedule_syntax
+        """
+        rng = random.Random(3)
+        steps = [
+            "r1(x)",
+            "w_3(y)",
+            "wl2(z)",
+            "c3",
+            "r4(x)",
+            "c4",
+            "a1",
+            "W1(x)",
+            "r1(xy)",
+            "(",
+            " ",
+        ]
+        for _ in range(200):
+            texts = [rng.choice(steps) for _ in range(rng.randrange(5))]
+            session = ScheduleSession("r1(x)", "".join(texts))
+            self.assertEqual(
+                SyntaxCheck.check_schedule_syntax(str(session)),
+                session.syntax_message(),
+            )
+            session = ScheduleSession("r1(x)")
+            for position, text in enumerate(texts):
+                session.insert(position, text)
+            self.assertEqual(
+                SyntaxCheck.check_schedule_syntax(str(session)),
+                session.syntax_message(),
+            )
+
+    def testSemantics(self):
+        """
+        test that the operations check follows SyntaxCheck.check
+        """
+        for schedule, result in [
+            ("w3(z)w3(z)", "w3(z)"),
+            ("w3(z)", "w3(z)w3(z)"),
+            ("w3(y)r1(y)r3(y)", "r3(y)w3(y)r1(y)"),
+            ("w1(y)r1(y)", "r1(y)w1(y)"),
+            ("w1(x)w1(x)r1(y)", "w1(x)r1(y)w1(x)"),
+            ("w1(x)w1(x)r1(y)", "w1(x)w1(x)r1(y)"),
+            ("r1(x)w2(x)", "r1(x)"),
+            ("r1(x)", "r1(x)w2(x)"),
+        ]:
+            session = ScheduleSession(schedule, result)
+            self.assertEqual(
+                SyntaxCheck.check(1, schedule, result), session.message(1), result
+            )
+        # swapping repeated operations and swapping them back
+        session = ScheduleSession("r1(x)w1(x)r1(x)w1(x)", "r1(x)w1(x)r1(x)w1(x)")
+        session.move(1, 2)
+        self.assertEqual("r1(x)r1(x)w1(x)w1(x)", str(session))
+        self.assertIsNotNone(session.message(1))
+        session.move(2, 1)
+        self.assertIsNone(session.message(1))
+
+    def testEdits(self):
+        """
+        test random insert / delete / move / replace edits against a full recheck
+        """
+        rng = random.Random(7)
+        example = self.getScheduleExamples()[1]
+        schedule = example["schedule"]
+        session = ScheduleSession(schedule, example["result"])
+        self.assertIsNone(session.message(2))
+        session.insert(3, "w1(x")
+        self.assertEqual(
+            f"Schedule '{session}' hat keine korrekte Syntax", session.syntax_message()
+        )
+        session.delete(3)
+        self.assertIsNone(session.syntax_message())
+        steps = [
+            "r1(x)",
+            "w2(y)",
+            "r3(z)",
+            "wl1(y)",
+            "c1",
+            "w_3(x)",
+            "r_2(z)",
+            "r4(x)",
+            "a2",
+        ]
+        for _ in range(300):
+            edit = rng.randrange(4)
+            if edit == 0 or len(session) < 2:
+                session.insert(rng.randint(0, len(session)), rng.choice(steps))
+            elif edit == 1:
+                session.delete(rng.randrange(len(session)))
+            elif edit == 2:
+                session.move(rng.randrange(len(session)), rng.randrange(len(session)))
+            else:
+                session.replace(rng.randrange(len(session)), rng.choice(steps))
+            self.assertConsistent(session, 2, schedule)
+
+    def testRenumber(self):
+        """
+        test inserting repeatedly at the same position until the keys are renumbered
+        """
+        session = ScheduleSession("w1(x)r2(x)")
+        session.insert(0, "r2(x)")
+        for _ in range(30):
+            session.insert(0, "w1(x)")
+            session.delete(0)
+        session.insert(0, "w1(x)")
+        self.assertEqual("w1(x)r2(x)", str(session))
+        self.assertTrue(session.is_operations_same())
+        self.assertEqual({(1, 2)}, session.conflict_edges())
+
+    def testEditLatency(self):
+        """
+        test that the work of an edit grows at most logarithmically with the size
+        of the schedule - for random edits of random schedules and for edits of an
+        operation which is repeated all over the schedule
+        """
+
+        def random_step(rng: random.Random) -> str:
+            return (
+                f"{rng.choice('rw')}{rng.randint(1, 3)}({chr(97 + rng.randrange(26))})"
+            )
+
+        def random_edits(size: int) -> float:
+            rng = random.Random(size)
+            schedule = "".join(random_step(rng) for _ in range(size))
+            session = ScheduleSession(schedule, schedule)
+            return measure(session, size, "random", lambda: random_edit(session, rng))
+
+        def random_edit(session: ScheduleSession, rng: random.Random):
+            edit = rng.randrange(4)
+            if edit == 0:
+                session.insert(rng.randint(0, len(session)), random_step(rng))
+            elif edit == 1:
+                session.delete(rng.randrange(len(session)))
+            elif edit == 2:
+                session.move(rng.randrange(len(session)), rng.randrange(len(session)))
+            else:
+                session.replace(rng.randrange(len(session)), random_step(rng))
+            session.message(1)
+
+        def repeated_edits(size: int) -> float:
+            schedule = "r1(x)w2(x)" * (size // 2)
+            session = ScheduleSession(schedule, schedule)
+
+            def edit():
+                session.insert(len(session) // 2, "r1(x)")
+                self.assertIsNotNone(session.message(1))
+                session.delete(len(session) // 2)
+                self.assertIsNone(session.message(1))
+
+            return measure(session, size, "repeated", edit)
+
+        def measure(session: ScheduleSession, size: int, name: str, edit) -> float:
+            number = 200
+            visits = session.visits()
+            start = time.perf_counter()
+            for _ in range(number):
+                edit()
+            elapsed = time.perf_counter() - start
+            visits = (session.visits() - visits) / number
+            if self.profile:
+                print(
+                    f"{name} edits of {size} steps: {elapsed / number * 1e6:.0f} µs, "
+                    f"{visits:.0f} index visits per edit"
+                )
+            return visits
+
+        for edits in [random_edits, repeated_edits]:
+            small = edits(2000)
+            large = edits(20000)
+            # log(20000) / log(2000) is about 1.3
+            self.assertLess(large, 2 * small)